@@ -34,6 +34,86 @@ class ProtonConfig(object):
 
     ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
     CACHE_LIFESPAN = 86400  # equivalent of 1 day = 86400 s.
+    # Route specific cache lifespan (in seconds) overriding CACHE_LIFESPAN & lifespan declared in cache_policy of
+    # respective controller entry. eg. {'/get_employee_report': 3600}
+    CACHE_LIFESPAN_PER_ROUTE = {}
+    CACHE_KEY_MAX_LENGTH = 256  # Longer cache keys are hashed.
+    CACHE_COMPRESSION_THRESHOLD = 1024  # bytes; larger responses are zlib compressed in redis. None disables.
+    CACHE_COMPRESSION_LEVEL = 6
+
+    # Redis nodes that make up the cache. Keys are spread across nodes by consistent hashing; each node is placed on
+    # the hash ring REDIS_VIRTUAL_NODES times. Adding or removing a node remaps only keys of that node.
+    REDIS_NODES = [{'host': 'redis', 'port': 6379, 'db': 0}]
+    REDIS_VIRTUAL_NODES = 160
+
+    # Redis connection pool per node; shared by every CacheManager consumer within a worker process.
+    REDIS_POOL_MAX_CONNECTIONS = 50
+    REDIS_SOCKET_TIMEOUT = 0.5  # seconds; applies to every redis command.
+    REDIS_SOCKET_CONNECT_TIMEOUT = 0.5  # seconds; applies while establishing a new connection.
+    REDIS_HEALTH_CHECK_INTERVAL = 30  # seconds; idle pooled connections are PINGed before reuse after this interval.
+    REDIS_BULK_BATCH_SIZE = 500  # keys per MGET/UNLINK/SET batch within a pipeline of bulk cache operations.
+    # Circuit breaker per redis node. After REDIS_BREAKER_FAILURE_THRESHOLD consecutive connection failures, node is
+    # skipped altogether for REDIS_BREAKER_RESET_TIMEOUT seconds; doubled after every unsuccessful probe up to the max.
+    REDIS_BREAKER_FAILURE_THRESHOLD = 5
+    REDIS_BREAKER_RESET_TIMEOUT = 1
+    REDIS_BREAKER_MAX_RESET_TIMEOUT = 60
+
+    # In-process (L1) response cache held by each worker in front of redis. Disabled by default.
+    CACHE_L1_ENABLED = False
+    CACHE_L1_MAX_ENTRIES = 1024
+    CACHE_L1_MAX_BYTES = 32 * 1024 * 1024
+    CACHE_L1_LIFESPAN = 60  # seconds; an L1 entry never outlives its redis counterpart.
+
+    # Concurrent cache misses for the same key within a worker wait for the first one to compute the response.
+    CACHE_COALESCE_ENABLED = True
+    CACHE_COALESCE_TIMEOUT = 5  # seconds; waiting requests fall through to conventional stack after this.
+
+    # Cache entries are retained in redis for CACHE_STALE_LIFESPAN seconds beyond their lifespan. A stale entry is
+    # served when conventional stack fails; and, with CACHE_STALE_WHILE_REVALIDATE, while it is refreshed in background.
+    CACHE_STALE_LIFESPAN = 0
+    CACHE_STALE_WHILE_REVALIDATE = False
+    # Probabilistic early refresh of entries nearing expiry (XFetch). Higher beta refreshes earlier; 0 disables.
+    CACHE_XFETCH_BETA = 1.0
+
+    # Responses are written to cache by a background writer per worker; off request path. Writes are flushed in
+    # pipelined batches and are dropped should the queue be full. Disable to write synchronously within request.
+    CACHE_WRITER_ENABLED = True
+    CACHE_WRITER_QUEUE_SIZE = 1000
+    CACHE_WRITER_BATCH_SIZE = 100
+
+    # Hot routes warmed into cache as each worker starts; /ready responds with 503 until warm-up is complete.
+    # eg. {'/get_employee_details': [{'employeeId': '1'}, {'employeeId': '2'}]}
+    CACHE_WARMUP_ROUTES = {}
+    CACHE_WARMUP_CONCURRENCY = 4  # responses computed in parallel during warm-up.
     TARGET_DB = 'sqlite'  # Other supported DB include postgresql, mysql, sqlserver.
 
+    # SQLite connections are held one per thread (greenlet under gevent). Database is switched to WAL journal; so,
+    # readers don't block the writer nor each other. Getters read over read-only connections.
+    SQLITE_JOURNAL_MODE = 'WAL'
+    SQLITE_SYNCHRONOUS = 'NORMAL'  # NORMAL is durable in WAL mode except for the last commits on a power loss.
+    SQLITE_CACHE_SIZE = -65536  # Negative values are KiB; i.e. 64 MiB page cache per connection.
+    SQLITE_MMAP_SIZE = 268435456  # bytes of database memory mapped per connection; 0 disables.
+    SQLITE_BUSY_TIMEOUT = 5000  # milliseconds a connection waits on a locked database before raising.
+
+    # Compiled SQL templates held by each model; least recently used are evicted first.
+    QUERY_TEMPLATE_CACHE_SIZE = 256
+
+    # Rows fetched & encoded at a time by streaming getters (getter['stream_model_data']).
+    STREAM_CHUNK_SIZE = 1000
+
+    # Inserts into existing tables are bulk loaded; COPY for postgres & executemany for sqlite. Tables that don't exist
+    # yet are created through pandas. Overridable per call; transaction['insert'](..., bulk=False).
+    BULK_INSERT_ENABLED = True
+    BULK_INSERT_CHUNK_SIZE = 10000  # rows per COPY/executemany.
+
+    # Read replicas of postgres are declared in databaseConfig.ini as [postgresql_replica_<n>] sections. Getters are
+    # load balanced across healthy replicas by REPLICA_LOAD_BALANCING; 'least_connections' or 'round_robin' (weighted
+    # by weight of each replica). Writes, and reads of tables written to within REPLICA_READ_AFTER_WRITE_WINDOW
+    # seconds by any worker, stay on primary; writes are marked in redis for the window. Should redis be unavailable,
+    # only writes of the same worker are known. A replica that can't be connected to is retried after
+    # REPLICA_RETRY_INTERVAL seconds.
+    REPLICA_LOAD_BALANCING = 'least_connections'
+    REPLICA_READ_AFTER_WRITE_WINDOW = 5
+    REPLICA_RETRY_INTERVAL = 30
+
     # If you change TARGET_DB to other provider, ensure databaseConfig.ini is updated accordingly.
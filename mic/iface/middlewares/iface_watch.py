@@ -22,10 +22,21 @@
 # WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json
+import falcon
+import math
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
+from nucleus.db.cache_codec import CacheCodec
+from nucleus.db.cache_key_builder import CacheKeyBuilder
 from nucleus.db.cache_manager import CacheManager
+from nucleus.db.cache_writer import CacheWriter
+from nucleus.db.local_cache import LocalCache
+from nucleus.generics.proton_metrics import ProtonMetrics
+from nucleus.generics.request_timer import RequestTimer
+from nucleus.generics.single_flight import SingleFlight
 
 __author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
 __copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
@@ -43,9 +54,97 @@ class Iface_watch(CacheManager):
         super(Iface_watch, self).__init__()
         self.logger = self.get_logger(log_file_name='interface_logs',
                                       log_file_path='{}/trace/interface_logs.log'.format(self.ROOT_DIR))
-        self.timer = {"start": 0, "end": 0}
-        self.cache_instance = None
-        self.cache_existence = False
+        # State held here is shared by all requests serviced by this worker; per request state (timer, cache key,
+        # cached response etc.) is held on req.context. Closures and redis instance are resolved once; redis instance
+        # borrows connections from CacheManager's pool.
+        self.cache_manager = self.cache_processor()
+        self.cache_instance = self.cache_manager['init_cache']()
+        self.cache_existence = self.cache_instance is not None
+        # Optional L1 held within this worker. Hits from L1 are tracked by LocalCache; hits from redis (L2) here.
+        self.local_cache = LocalCache(self.CACHE_L1_MAX_ENTRIES,
+                                      self.CACHE_L1_MAX_BYTES) if self.CACHE_L1_ENABLED else None
+        self.__l2_cache_stats = {'hits': 0, 'misses': 0, 'stale': 0}
+        self.__l2_cache_stats_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        # Responses are written to redis off request path unless CACHE_WRITER_ENABLED is False.
+        self.cache_writer = CacheWriter(self.__write, self.CACHE_WRITER_QUEUE_SIZE, self.CACHE_WRITER_BATCH_SIZE,
+                                        self.logger) if self.CACHE_WRITER_ENABLED else None
+        # Interface controllers per route; used to refresh cache entries outside of request cycle.
+        self.route_resources = {}
+        # cache_policy declared per route alongside respective controller_processor entries.
+        self.route_policies = {}
+        # MIC each route belongs to; cache keys are namespaced by MIC.
+        self.route_namespaces = {}
+        # Set once warm-up is complete; until then, worker is not ready.
+        self.cache_warm = threading.Event()
+
+    def register_route(self, route, resource):
+        """
+        Make Iface_watch aware of interface controller servicing a route & the cache_policy it declares. Cache
+        entries of routes whose resources expose get_response can be refreshed in background.
+        :param route: Route as added to falcon app. eg. /get_employee_details
+        :param resource: Interface controller instance for the route.
+        :return: void
+        """
+        if hasattr(resource, 'get_response'):
+            self.route_resources[route] = resource
+        self.route_policies[route] = dict(getattr(resource, 'cache_policy', None) or {})
+        if not self.route_policies[route].get('tables') and getattr(resource, 'target_db_table', None):
+            # Unless declared otherwise, responses are read from the table MIC targets.
+            self.route_policies[route]['tables'] = [resource.target_db_table]
+        self.route_namespaces[route] = getattr(resource, 'mic_name', 'proton')
+
+    def warm_up(self, routes=None):
+        """
+        Warm cache with responses of hot routes in background; entries already in cache are left as is. Routes must be
+        registered beforehand. Routes caching responses per user can't be warmed and are skipped.
+        :param routes: A dictionary of route to list of query params dictionaries. Defaults to CACHE_WARMUP_ROUTES.
+        :return: warm-up thread; cache_warm is set once it is done.
+        """
+        routes = self.CACHE_WARMUP_ROUTES if routes is None else routes
+        warm_up_thread = threading.Thread(target=self.__warm_up, args=(routes,), name='proton-cache-warm-up',
+                                          daemon=True)
+        warm_up_thread.start()
+        return warm_up_thread
+
+    def __warm_up(self, routes):
+        warm_up_start = time.time()
+        try:
+            warm_ups = []
+            for route, query_params_list in routes.items():
+                cache_policy = self.__cache_policy(route)
+                if route not in self.route_resources or cache_policy['bypass'] or cache_policy['per_user']:
+                    self.logger.warning('[Iface_watch] Route {} is not registered or does not share its responses '
+                                        'across users; it is skipped from warm-up.'.format(route))
+                    continue
+                for query_params in query_params_list:
+                    cache_key = CacheKeyBuilder.build(namespace=self.route_namespaces.get(route, 'proton'),
+                                                      method='GET', route=route, params=query_params,
+                                                      vary_by=cache_policy['vary_by'])
+                    warm_ups.append((self.route_resources[route], route, query_params, cache_key))
+
+            if warm_ups and self.cache_existence:
+                # Another worker may have warmed these already; one round trip tells which ones are missing.
+                cache_entries = self.cache_manager['get_many_from_cache'](
+                    self.cache_instance, [warm_up[3] for warm_up in warm_ups]) or [None] * len(warm_ups)
+                warm_ups = [warm_up for warm_up, cache_entry in zip(warm_ups, cache_entries) if cache_entry is None]
+
+            with ThreadPoolExecutor(max_workers=self.CACHE_WARMUP_CONCURRENCY) as executor:
+                list(executor.map(lambda warm_up: self.__warm(*warm_up), warm_ups))
+            if self.cache_writer is not None:
+                self.cache_writer.join()
+            self.logger.info('[Iface_watch] Cache warm-up of {} entries is complete in {} seconds.'.format(
+                len(warm_ups), time.time() - warm_up_start))
+        except Exception as e:
+            self.logger.exception('[Iface_watch] Cache warm-up is unsuccessful. Details: {}'.format(str(e)))
+        finally:
+            self.cache_warm.set()
+
+    def __warm(self, resource, route, query_params, cache_key):
+        # Requests arriving meanwhile for the same key wait on warm-up instead of computing the response again.
+        leader, flight = self.single_flight.acquire(cache_key)
+        if leader:
+            self.__refresh(resource, route, query_params, cache_key)
 
     def process_request(self, req, resp):
         """
@@ -53,62 +152,41 @@ class Iface_watch(CacheManager):
         :param resp:
         :return:
         """
-        self.timer["start"] = time.time()
         self.logger.info('[Iface_watch] | Requested Route: {}'.format(req.path))
 
-        if (req.path in ['/', '/fast-serve', '/metrics', '/proton-prom', '/proton-grafana']):
+        if (req.path in ['/', '/fast-serve', '/metrics', '/proton-prom', '/proton-grafana', '/ready']):
             pass
         else:
             # Check if response can be served from cache.
-            # Instantiate Cache
-            self.cache_instance = self.cache_processor()['init_cache']()
-            self.cache_existence = self.cache_processor()['ping_cache'](self.cache_instance)
-
-            if self.cache_existence:
-
-                try:
-                    if req.method != 'POST' and req.context['cache_ready'] is True:
-                        print(Fore.MAGENTA + 'PROTON stack has the instantiated Cache! We are on STEROIDS '
-                              'now!!' + Style.RESET_ALL)
-                        route_path_contents = req.path.split('_')[1:]
-                        cache_key = '_'.join(route_path_contents)
-
-                        for key, value in req.params.items():
-                            cache_key = cache_key + '_' + key + '_' + value
-
-                        cache_response = json.loads(self.cache_processor()['get_from_cache'](self.cache_instance,
-                                                                                             'c_{}'.format(cache_key)))
-                        time_when_cache_was_set = (self.cache_processor()['get_from_cache'](self.cache_instance,
-                                                                                            'c_setTime_{}'.format(cache_key)))
-                        cache_set_time = 0 if time_when_cache_was_set is None else int(time_when_cache_was_set)
-                        current_time = int(time.time())
-                        if time_when_cache_was_set is not None:
-                            cache_delta_for_route = current_time - cache_set_time
-                        else:
-                            cache_delta_for_route = 0
-
-                        if cache_response is not None:
-                            if cache_delta_for_route > self.CACHE_LIFESPAN:
-                                self.cache_processor()['delete_from_cache'](self.cache_instance,
-                                                                            'c_{}'.format(cache_key))
-                                self.cache_processor()['delete_from_cache'](self.cache_instance,
-                                                                            'c_setTime_{}'.format(cache_key))
-                                self.logger.info('Cache is deleted for route {}. It has exceeded its '
-                                                 'lifespan!'.format(req.path))
-                            else:
-                                print(Fore.GREEN + 'Response is served from cache for route {}. DB service of PROTON '
-                                      'stack is spared!'.format(req.path) + Style.RESET_ALL)
-                                resp.body = cache_response
-                                req.path = '/fast-serve'
+            try:
+                cache_policy = self.__cache_policy(req.path)
+                if req.method != 'POST' and req.context['cache_ready'] is True and not cache_policy['bypass']:
+                    cache_key = self.__cache_key(req, cache_policy)
+                    with RequestTimer.measure('cache'):
+                        cache_response = self.__lookup(req, cache_key)
+
+                        if cache_response is None and self.CACHE_COALESCE_ENABLED:
+                            cache_response = self.__coalesce(req, cache_key)
+
+                        if cache_response is None:
+                            # Read before the response is computed; see __store.
+                            req.context.cache_tag_versions = self.__tag_versions(cache_policy)
+                            req.context.cache_l1_generations = self.__l1_generations(cache_policy)
+
+                    if cache_response is not None:
+                        req.context.cache_not_modified = self.__serve(req, resp, cache_response)
+                        # Route is retained for metrics; path is rerouted to sink.
+                        req.context.route = req.path
+                        req.path = '/fast-serve'
                     else:
-                        # Go through conventional PROTON stack.
-                        pass
-                except Exception as e:
-                    self.logger.exception('[Iface_watch]. Error while extracting response from cache. '
-                                          'Details: {}'.format(str(e)))
-            else:
-                print(Fore.LIGHTMAGENTA_EX + 'Cache is unavailable. PROTON will continue to rely on database & function'
-                                             ' as usual.' + Style.RESET_ALL)
+                        ProtonMetrics.cache_misses.labels(route=self.__route_label(req.path)).inc()
+                        req.context.cache_compute_start = time.time()
+                else:
+                    # Go through conventional PROTON stack.
+                    pass
+            except Exception as e:
+                self.logger.exception('[Iface_watch]. Error while extracting response from cache. '
+                                      'Details: {}'.format(str(e)))
 
     def process_response(self, req, resp, resource, req_succeded):
         """
@@ -119,43 +197,396 @@ class Iface_watch(CacheManager):
         :param req_succeded:
         :return:
         """
+        request_start = req.context.timer.start if req.context.get('timer') is not None else time.time()
         self.logger.info('[Iface_watch] | Response status: {} | '
-                         'Response time: {} seconds'.format(req_succeded, time.time() - self.timer["start"]))
+                         'Response time: {} seconds'.format(req_succeded, time.time() - request_start))
 
-        if (req.path in ['/', '/fast-serve', '/metrics', '/proton-prom', '/proton-grafana']):
+        if req.path == '/fast-serve' and req.context.get('cache_not_modified'):
+            # Client holds the cached response already. FastServe responds with 200; hence, status is set here.
+            resp.status = falcon.HTTP_304
+        elif (req.path in ['/', '/fast-serve', '/metrics', '/proton-prom', '/proton-grafana', '/ready']):
             pass
         else:
-            # Check if response can be served from cache.
-            # Instantiate Cache
-            self.cache_instance = self.cache_processor()['init_cache']()
-            self.cache_existence = self.cache_processor()['ping_cache'](self.cache_instance)
+            try:
+                cache_policy = self.__cache_policy(req.path)
+                if req.method != 'POST' and req.context['cache_ready'] is True and not cache_policy['bypass']:
+                    cache_key = self.__cache_key(req, cache_policy)
 
-            if self.cache_existence:
-                try:
-                    if req.method != 'POST' and req.context['cache_ready'] is True:
-                        route_path_contents = req.path.split('_')[1:]
-                        cache_key = '_'.join(route_path_contents)
-
-                        for key, value in req.params.items():
-                            cache_key = cache_key + '_' + key + '_' + value
-
-                        cache_response = self.cache_processor()['get_from_cache'](self.cache_instance,
-                                                                                  'c_{}'.format(cache_key))
-                        if cache_response is None:
-                            self.cache_processor()['set_to_cache'](self.cache_instance, 'c_{}'.format(cache_key),
-                                                                   json.dumps(resp.body))
-                            time_when_set = int(time.time())
-                            self.cache_processor()['set_to_cache'](self.cache_instance,
-                                                                   'c_setTime_{}'.format(cache_key), time_when_set)
-                            self.logger.info('Cache set for key : {} @ {}'.format('c_' + cache_key, time_when_set))
+                    # Route reached the conventional PROTON stack; i.e. there was no live entry in cache.
+                    compute_time = time.time() - req.context.get('cache_compute_start', request_start)
+                    response_body = self.__response_body(resp)
+                    if req_succeded and self.__is_cacheable(resp.status, response_body):
+                        cache_response = (response_body, resp.content_type, CacheCodec.etag(response_body))
+                        req.context.cache_response = cache_response
+                        with RequestTimer.measure('cache'):
+                            cache_stored = self.__store(req.path, cache_key, cache_response, compute_time,
+                                                        req.context.get('cache_tag_versions'),
+                                                        req.context.get('cache_l1_generations'))
+                        if cache_stored:
                             print(Fore.GREEN + 'Cache is set for route {} along with consideration for query params. '
                                                'Subsequent requests for this route will be serviced by '
                                                'cache.'.format(req.path) + Style.RESET_ALL)
-                    else:
-                        # Cache is already set to this route or the request type is POST
-                        pass
+                        if self.__serve(req, resp, cache_response):
+                            resp.status = falcon.HTTP_304
+
+                    elif req.context.get('cache_stale_response') is not None:
+                        # Conventional stack has failed. A stale response is better than none.
+                        self.__count_l2('stale')
+                        ProtonMetrics.cache_stale.labels(route=self.__route_label(req.path)).inc()
+                        not_modified = self.__serve(req, resp, req.context.cache_stale_response)
+                        resp.status = falcon.HTTP_304 if not_modified else falcon.HTTP_200
+                        resp.set_header('Warning', '110 - "Response is Stale"')
+                        print(Fore.YELLOW + 'Stale response is served from cache for route {} as conventional PROTON '
+                                            'stack was unsuccessful.'.format(req.path) + Style.RESET_ALL)
+                else:
+                    # Request type is POST, the request is not authenticated or route bypasses cache.
+                    pass
+
+            except Exception as e:
+                self.logger.exception('[Iface_watch]. Error while extracting response from cache. '
+                                      'Details: {}'.format(str(e)))
+                # Letting the request go through to conventional PROTON stack.
+
+        if req.context.get('cache_flight') is not None:
+            # Hand over response to requests waiting on this one. Followers are served through FastServe with 200;
+            # so, only successful responses (__is_cacheable) are shared. Followers of an unsuccessful leader go through
+            # conventional PROTON stack themselves.
+            shared_response = req.context.get('cache_response') if req_succeded else None
+            self.single_flight.release(req.context.cache_flight, shared_response)
+
+    @staticmethod
+    def __is_cacheable(status, body):
+        # Streamed responses (resp.stream) are never cached.
+        return isinstance(body, bytes) and str(status).startswith('200')
+
+    @staticmethod
+    def __response_body(resp):
+        """
+        :param resp: falcon response
+        :return: Response body as bytes; None if response has no body.
+        """
+        body = resp.body if resp.body is not None else resp.data
+        return body.encode('utf-8') if isinstance(body, str) else body
+
+    @staticmethod
+    def __serve(req, resp, cache_response):
+        """
+        Serve cached response as is; raw bytes through resp.data, along with its ETag. Should the client already hold
+        the response (If-None-Match), no body is sent.
+        :param req: falcon request
+        :param resp: falcon response
+        :param cache_response: A tuple of response body (bytes), content type & ETag.
+        :return: Bool indicating if response is not modified for the client; i.e. 304 is due.
+        """
+        body, content_type, etag = cache_response
+        resp.body = None
+        resp.set_header('ETag', '"{}"'.format(etag))
+        if_none_match = req.get_header('If-None-Match')
+        if if_none_match is not None:
+            client_etags = [client_etag.strip() for client_etag in if_none_match.split(',')]
+            if '*' in client_etags or any(client_etag.replace('W/', '', 1).strip('"') == etag
+                                          for client_etag in client_etags):
+                resp.data = None
+                resp.content_type = None
+                return True
+        resp.data, resp.content_type = body, content_type
+        return False
+
+    def __cache_policy(self, route):
+        """
+        Effective cache policy for a route. cache_policy declared alongside controller_processor entry is laid over
+        PROTON defaults; lifespan in ProtonConfig.CACHE_LIFESPAN_PER_ROUTE takes precedence over both.
+        :param route: A valid route.
+        :return: A dictionary of lifespan, vary_by, bypass, per_user, empty_result_lifespan, max_body_size & tables.
+        """
+        cache_policy = {'lifespan': self.CACHE_LIFESPAN, 'vary_by': None, 'bypass': False, 'per_user': False,
+                        'empty_result_lifespan': None, 'max_body_size': None, 'tables': None}
+        cache_policy.update(self.route_policies.get(route, {}))
+        if route in self.CACHE_LIFESPAN_PER_ROUTE:
+            cache_policy['lifespan'] = self.CACHE_LIFESPAN_PER_ROUTE[route]
+        return cache_policy
+
+    def __route_label(self, route):
+        """
+        Route as labelled in metrics. Paths that are not registered routes are labelled alike; so, arbitrary paths
+        requested by clients can't blow up the number of time series.
+        :param route: Requested path.
+        :return: route label
+        """
+        return route if route in self.route_policies else 'unregistered'
+
+    def __cache_key(self, req, cache_policy):
+        return CacheKeyBuilder.build(namespace=self.route_namespaces.get(req.path, 'proton'), method=req.method,
+                                     route=req.path, params=req.params, vary_by=cache_policy['vary_by'],
+                                     user_scope=req.context.get('encode_value') if cache_policy['per_user'] else None)
+
+    @staticmethod
+    def __cache_lifespan(cache_policy, response):
+        """
+        Lifespan of a response as per cache policy of its route.
+        :param cache_policy: Effective cache policy of the route.
+        :param response: Response body as bytes.
+        :return: Lifespan in seconds. 0 implies response must not be cached.
+        """
+        if cache_policy['max_body_size'] is not None and len(response) > cache_policy['max_body_size']:
+            return 0
+        if cache_policy['empty_result_lifespan'] is not None and response.strip() in (b'', b'[]', b'{}', b'null'):
+            return cache_policy['empty_result_lifespan']
+        return cache_policy['lifespan']
+
+    def __lookup(self, req, cache_key):
+        """
+        Look up response in L1 (in-process) and then in L2 (redis). Every L2 entry carries the time it expires at &
+        the time it took to compute; entries are retained in redis for CACHE_STALE_LIFESPAN seconds beyond expiry.
+        :param req: falcon request
+        :param cache_key: A valid cache key.
+        :return: A tuple of response body (bytes), content type & ETag from cache; None if there is no response to be
+        served.
+        """
+        # L1: In-process cache. No I/O.
+        if self.local_cache is not None:
+            cache_response = self.local_cache.get(cache_key)
+            if cache_response is not None:
+                ProtonMetrics.cache_hits.labels(route=self.__route_label(req.path), tier='l1').inc()
+                print(Fore.GREEN + 'Response is served from L1 cache for route {}. DB service of PROTON '
+                                   'stack is spared!'.format(req.path) + Style.RESET_ALL)
+                return cache_response
+
+        if not self.cache_existence:
+            print(Fore.LIGHTMAGENTA_EX + 'Cache is unavailable. PROTON will continue to rely on database & function'
+                                         ' as usual.' + Style.RESET_ALL)
+            return None
+
+        if not self.cache_manager['cache_available'](self.cache_instance, cache_key):
+            # Circuit for redis node of this key is open; conventional stack is relied upon without waiting on redis.
+            return None
+
+        # L2: Redis. A single round trip; Redis expires entries on its own.
+        print(Fore.MAGENTA + 'PROTON stack has the instantiated Cache! We are on STEROIDS now!!' + Style.RESET_ALL)
+        cache_policy = self.__cache_policy(req.path)
+        l1_generations = self.__l1_generations(cache_policy)
+        cache_entry = self.cache_manager['get_from_cache'](self.cache_instance, cache_key)
+        if cache_entry is None:
+            self.__count_l2('misses')
+            return None
+
+        try:
+            cache_entry = CacheCodec.decode(cache_entry)
+        except ValueError:
+            # Entry written in an older/unknown format; treat as a miss and let it be overwritten.
+            self.__count_l2('misses')
+            return None
+        cache_response = (cache_entry['body'], cache_entry['content_type'], cache_entry['etag'])
+        remaining_lifespan = cache_entry['expires_at'] - time.time()
+        if remaining_lifespan > 0:
+            self.__count_l2('hits')
+            ProtonMetrics.cache_hits.labels(route=self.__route_label(req.path), tier='l2').inc()
+            print(Fore.GREEN + 'Response is served from L2 cache for route {}. DB service of PROTON '
+                               'stack is spared!'.format(req.path) + Style.RESET_ALL)
+            if self.local_cache is not None:
+                self.local_cache.set(cache_key, cache_response, min(self.CACHE_L1_LIFESPAN, remaining_lifespan),
+                                     size=len(cache_entry['body']), tags=self.__tags(cache_policy),
+                                     generations=l1_generations)
+            if self.__refresh_early(cache_entry):
+                self.__revalidate(req, cache_key)
+            return cache_response
+
+        # Entry has outlived its lifespan and is retained only as a stale copy.
+        if self.CACHE_STALE_WHILE_REVALIDATE and self.__revalidate(req, cache_key):
+            self.__count_l2('stale')
+            ProtonMetrics.cache_stale.labels(route=self.__route_label(req.path)).inc()
+            print(Fore.YELLOW + 'Stale response is served from cache for route {} while it is being '
+                                'refreshed.'.format(req.path) + Style.RESET_ALL)
+            return cache_response
+
+        # Keep stale copy handy; should conventional PROTON stack fail.
+        req.context.cache_stale_response = cache_response
+        self.__count_l2('misses')
+        return None
+
+    def __refresh_early(self, cache_entry):
+        """
+        Probabilistic early expiration (XFetch). Likelihood of refresh grows as entry nears its expiry and with the
+        time it takes to compute the entry; so, hot & expensive entries are refreshed before they expire.
+        :param cache_entry: cache entry from L2.
+        :return: Bool indicating if entry must be refreshed now.
+        """
+        if self.CACHE_XFETCH_BETA <= 0:
+            return False
+        return (time.time() - cache_entry['delta'] * self.CACHE_XFETCH_BETA * math.log(1.0 - random.random()) >=
+                cache_entry['expires_at'])
 
-                except Exception as e:
-                    self.logger.exception('[Iface_watch]. Error while extracting response from cache. '
-                                          'Details: {}'.format(str(e)))
-                    # Letting the request go through to conventional PROTON stack.
+    def __revalidate(self, req, cache_key):
+        """
+        Refresh cache entry in background; at most one refresh per key is in progress within this worker.
+        :param req: falcon request
+        :param cache_key: A valid cache key.
+        :return: Bool indicating if the entry is being refreshed.
+        """
+        resource = self.route_resources.get(req.path)
+        if resource is None:
+            return False
+
+        leader, flight = self.single_flight.acquire(cache_key)
+        if leader:
+            refresher = threading.Thread(target=self.__refresh,
+                                         args=(resource, req.path, dict(req.params.items()), cache_key))
+            refresher.daemon = True
+            refresher.start()
+        return True
+
+    def __refresh(self, resource, route, query_params, cache_key):
+        """
+        Compute response via interface controller and set it to cache. Runs outside of request cycle.
+        :param resource: Interface controller registered for the route.
+        :param route: Route of the cache entry.
+        :param query_params: Query params the cache entry was computed for.
+        :param cache_key: A valid cache key.
+        :return: void
+        """
+        response = None
+        try:
+            compute_start = time.time()
+            cache_policy = self.__cache_policy(route)
+            tag_versions = self.__tag_versions(cache_policy)
+            l1_generations = self.__l1_generations(cache_policy)
+            response_body, status = resource.get_response(query_params)
+            if isinstance(response_body, str):
+                response_body = response_body.encode('utf-8')
+            if self.__is_cacheable(status, response_body):
+                response = (response_body, falcon.MEDIA_JSON, CacheCodec.etag(response_body))
+                self.__store(route, cache_key, response, time.time() - compute_start, tag_versions, l1_generations)
+            else:
+                response = None
+                if not isinstance(response_body, (str, bytes)) and hasattr(response_body, 'close'):
+                    # Streamed response (e.g. RowStream) is not cached; closing it returns its pooled connection.
+                    response_body.close()
+                self.logger.info('[Iface_watch] Refresh for cache key {} was unsuccessful. Stale entry is '
+                                 'retained.'.format(cache_key))
+        except Exception as e:
+            response = None
+            self.logger.exception('[Iface_watch]. Error while refreshing cache key {}. '
+                                  'Details: {}'.format(cache_key, str(e)))
+        finally:
+            self.single_flight.release(cache_key, response)
+
+    @staticmethod
+    def __tags(cache_policy):
+        # Responses are tagged by tables they are read from; writes to those tables invalidate them.
+        return [CacheKeyBuilder.tag(table) for table in cache_policy['tables'] or []]
+
+    def __tag_versions(self, cache_policy):
+        """
+        Versions of tags of a route; to be read before its response is computed.
+        :param cache_policy: Effective cache policy of the route.
+        :return: A dictionary of tag to version; None if route has no tags. Tags whose versions are unavailable are
+        absent; responses are then not set to L2.
+        """
+        tags = self.__tags(cache_policy)
+        if not tags or not self.cache_existence:
+            return None
+        return self.cache_manager['get_tag_versions_from_cache'](self.cache_instance, tags) or {}
+
+    def __l1_generations(self, cache_policy):
+        """
+        Generations of tags of a route in L1; to be read before its response is computed.
+        :param cache_policy: Effective cache policy of the route.
+        :return: A dictionary of tag to generation; None if L1 is disabled.
+        """
+        if self.local_cache is None:
+            return None
+        return self.local_cache.generations(self.__tags(cache_policy))
+
+    def __store(self, route, cache_key, cache_response, compute_time, tag_versions=None, l1_generations=None):
+        """
+        Set response to L2 and L1 as per cache policy of the route. L1 is set right away; L2 write is handed over to
+        cache writer.
+
+        Response is set to L2 only if its tags are not invalidated since tag_versions were read; so, a response
+        computed before a write to its tables does not outlive invalidation by that write, however late it is set.
+        L1 entries are tagged likewise; writes of this worker drop them (see LocalCache.invalidate_tags_in_process).
+        :param route: Route of the response.
+        :param cache_key: A valid cache key.
+        :param cache_response: A tuple of response body (bytes), content type & ETag.
+        :param compute_time: Time in seconds it took to compute the response.
+        :param tag_versions: Versions of tags of the route as read before computing the response; see __tag_versions.
+        None sets the response regardless.
+        :param l1_generations: Generations of tags of the route in L1 as read before computing the response; see
+        __l1_generations. None sets the response to L1 regardless.
+        :return: Bool indicating if response is cached (or queued to be).
+        """
+        response, content_type, etag = cache_response
+        cache_policy = self.__cache_policy(route)
+        cache_lifespan = self.__cache_lifespan(cache_policy, response)
+        if not cache_lifespan:
+            return False
+        if self.cache_existence:
+            write = {'route': route, 'key': cache_key, 'response': response, 'content_type': content_type,
+                     'etag': etag, 'expires_at': time.time() + cache_lifespan, 'delta': compute_time,
+                     'lifespan': cache_lifespan + self.CACHE_STALE_LIFESPAN, 'tags': self.__tags(cache_policy),
+                     'tag_versions': tag_versions}
+            if self.cache_writer is None:
+                self.__write([write])
+            elif not self.cache_writer.submit(write):
+                self.logger.warning('[Iface_watch] Cache writer queue is full; cache write for key {} is '
+                                    'dropped.'.format(cache_key))
+        if self.local_cache is not None:
+            self.local_cache.set(cache_key, cache_response, min(self.CACHE_L1_LIFESPAN, cache_lifespan),
+                                 size=len(response), tags=self.__tags(cache_policy), generations=l1_generations)
+        self.logger.info('Cache set for key : {} with lifespan of {} seconds'.format(cache_key, cache_lifespan))
+        return True
+
+    def __write(self, writes):
+        """
+        Encode & write responses to redis; all of them in a single pipeline.
+        :param writes: A list of writes as prepared by __store.
+        :return: void
+        """
+        entries = []
+        for write in writes:
+            cache_entry = CacheCodec.encode(write['response'], write['content_type'], write['expires_at'],
+                                            write['delta'], self.CACHE_COMPRESSION_THRESHOLD,
+                                            self.CACHE_COMPRESSION_LEVEL, write['etag'])
+            ProtonMetrics.cache_payload_size.labels(route=self.__route_label(write['route'])).observe(len(cache_entry))
+            entries.append((write['key'], cache_entry, write['lifespan'], write['tags'], write.get('tag_versions')))
+        self.cache_manager['set_many_with_tags_to_cache'](self.cache_instance, entries)
+
+    def __coalesce(self, req, cache_key):
+        """
+        Coalesce concurrent cache misses for the same key within this worker. First request (leader) goes through
+        conventional PROTON stack; rest wait for leader's response for up to CACHE_COALESCE_TIMEOUT seconds.
+        :param req: falcon request
+        :param cache_key: A valid cache key.
+        :return: A tuple of response body, content type & ETag produced by leader; None if this request is the leader,
+        if leader's response was unsuccessful (not 200) or if waiting was unsuccessful.
+        """
+        leader, flight = self.single_flight.acquire(cache_key)
+        if leader:
+            req.context.cache_flight = cache_key
+            return None
+
+        response = self.single_flight.wait(flight, self.CACHE_COALESCE_TIMEOUT)
+        if response is not None:
+            ProtonMetrics.cache_hits.labels(route=self.__route_label(req.path), tier='coalesced').inc()
+            print(Fore.GREEN + 'Response is served from a coalesced request for route {}. DB service of PROTON '
+                  'stack is spared!'.format(req.path) + Style.RESET_ALL)
+        return response
+
+    def __count_l2(self, stat):
+        # Requests are served concurrently by threads of a worker; counts are updated under lock.
+        with self.__l2_cache_stats_lock:
+            self.__l2_cache_stats[stat] += 1
+
+    def __l2_stats(self):
+        with self.__l2_cache_stats_lock:
+            return dict(self.__l2_cache_stats)
+
+    def cache_statistics(self):
+        """
+        Hit & miss counts of L1 (in-process) and L2 (redis) cache tiers of this worker; reported separately.
+        :return: A dictionary of statistics per tier. L1 is None if it is not enabled.
+        """
+        return {
+            'l1': None if self.local_cache is None else self.local_cache.stats(),
+            'l2': self.__l2_stats()
+        }
@@ -22,6 +22,7 @@
 # WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from nucleus.generics.proton_metrics import ProtonMetrics
 from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
 import time
 
@@ -54,12 +55,15 @@ class ProtonPrometheus(object):
     def process_response(self, req, resp, resource, req_succeeded):
         if 'start_time' in req.context:
             resp_time = time.time() - req.context.start_time
+            # Responses served from cache are rerouted to /fast-serve; they are labelled by route requested.
+            path = req.context.get('route', req.path)
 
-            self.requests.labels(method=req.method, path=req.path, status=resp.status).inc()
-            self.request_historygram.labels(method=req.method, path=req.path, status=resp.status).observe(resp_time)
+            self.requests.labels(method=req.method, path=path, status=resp.status).inc()
+            self.request_historygram.labels(method=req.method, path=path, status=resp.status).observe(resp_time)
 
     def on_get(self, req, resp):
-        data = generate_latest(self.registry)
+        # Request metrics of this middleware followed by metrics of PROTON's internals; i.e. cache, redis etc.
+        data = generate_latest(self.registry) + generate_latest(ProtonMetrics.registry)
         resp.content_type = 'text/plain; version=0.0.4; charset=utf-8'
         resp.body = str(data.decode('utf-8'))
 
@@ -0,0 +1,58 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from nucleus.generics.proton_metrics import ProtonMetrics
+from nucleus.generics.request_timer import RequestTimer
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class RequestTiming(object):
+    """
+    Times phases of each request. This middleware must be the first of the middlewares wired to main executor; so,
+    its timer is in place before any other middleware acts upon the request and it reports once all of them are done.
+
+    Timer is held on req.context.timer. Breakdown of phases is sent to client as Server-Timing header and is recorded in
+    ProtonMetrics.request_phase_latency.
+    """
+
+    def __init__(self):
+        super(RequestTiming, self).__init__()
+
+    def process_request(self, req, resp):
+        req.context.timer = RequestTimer()
+        req.context.timer.activate()
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        timer = req.context.get('timer')
+        if timer is None:
+            return
+        timer.deactivate()
+        resp.set_header('Server-Timing', timer.server_timing())
+        # Responses served from cache are rerouted to /fast-serve; they are labelled by route requested.
+        route = req.context.get('route') or req.uri_template or 'unregistered'
+        for phase, duration in timer.phases.items():
+            ProtonMetrics.request_phase_latency.labels(route=route, phase=phase).observe(duration)
@@ -25,6 +25,7 @@
 from configuration import ProtonConfig
 from nucleus.iam.jwt_manager import JWTManager
 from nucleus.generics.log_utilities import LogUtilities
+from nucleus.generics.request_timer import RequestTimer
 import falcon
 import time
 
@@ -48,6 +49,15 @@ class TokenAuthenticator(LogUtilities, ProtonConfig, JWTManager):
         :param resp:
         :return:
         """
+        with RequestTimer.measure('auth'):
+            self.__authenticate(req)
+
+    def __authenticate(self, req):
+        """
+        Authenticate request via token in Authorization header.
+        :param req:
+        :return: void; raises falcon.HTTPUnauthorized if token is missing or invalid.
+        """
         # TODO: Validate JWT Token and on success, bind to req object.
         if (req.path in ['/',
                          '/fast-serve',
@@ -55,7 +65,8 @@ class TokenAuthenticator(LogUtilities, ProtonConfig, JWTManager):
                          '/login',
                          '/metrics',
                          '/proton-prom',
-                         '/proton-grafana']):
+                         '/proton-grafana',
+                         '/ready']):
             pass
         else:
             setattr(req.context, 'cache_ready', False)
@@ -67,7 +78,8 @@ class TokenAuthenticator(LogUtilities, ProtonConfig, JWTManager):
                 raise falcon.HTTPUnauthorized('Auth token required.', 'Please provide an auth token via Authorization '
                                                                       'header; as part of the request.', challenges)
             else:
-                if not self.authenticate(token)['status']:
+                authentication = self.authenticate(token)
+                if not authentication['status']:
                     self.logger.exception('[Token Authenticator]: Request to {}[{}] has failed '
                                           'authentication. Token - [] is expired/invalid'.format(req.path, req.uri,
                                                                                                  token))
@@ -75,5 +87,7 @@ class TokenAuthenticator(LogUtilities, ProtonConfig, JWTManager):
                                                                               'invalid.', challenges)
                 else:
                     setattr(req.context, 'cache_ready', True)
+                    # Identity of the user; Iface_watch scopes cache entries of per user routes with this.
+                    setattr(req.context, 'encode_value', authentication['encode_value'])
                     self.logger.info('[Token Authenticator]: Request to {}[{}] is valid.'.format(req.path, req.uri))
 
@@ -0,0 +1,135 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import datetime
+import io
+import itertools
+import json
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class BulkLoader(object):
+    """
+    Loads rows into an existing table in bulk; COPY ... FROM STDIN for Postgres and executemany for SQLite. Rows are
+    loaded chunk_size at a time within a single transaction; so, memory held is bound by chunk_size and the load is
+    all or nothing.
+    """
+
+    __copy_escapes = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+    @staticmethod
+    def chunks(rows, chunk_size):
+        """
+        :param rows: An iterable of rows.
+        :param chunk_size: Rows per chunk.
+        :return: Generator of lists of up to chunk_size rows.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def quote(identifier):
+        """
+        :param identifier: Name of a schema, table or column.
+        :return: Identifier quoted for SQL.
+        """
+        return '"{}"'.format(str(identifier).replace('"', '""'))
+
+    @classmethod
+    def copy_value(cls, value):
+        """
+        :param value: A value of a row.
+        :return: Value in text format of COPY.
+        """
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = '\\x' + bytes(value).hex()
+        return str(value).translate(cls.__copy_escapes)
+
+    @classmethod
+    def copy_buffer(cls, rows):
+        """
+        :param rows: A list of rows.
+        :return: In-memory buffer of rows in text format of COPY.
+        """
+        return io.StringIO(''.join('\t'.join(cls.copy_value(value) for value in row) + '\n' for row in rows))
+
+    @classmethod
+    def copy_to_postgres(cls, cursor, schema_name, table_name, columns, rows, chunk_size):
+        """
+        COPY rows into a Postgres table; one COPY per chunk. Caller commits.
+        :param cursor: psycopg2 cursor.
+        :param schema_name: Target schema.
+        :param table_name: Target table.
+        :param columns: Column names; in order of values in rows.
+        :param rows: An iterable of rows.
+        :param chunk_size: Rows per COPY.
+        :return: Number of rows loaded.
+        """
+        copy_sql = 'COPY {}.{} ({}) FROM STDIN'.format(cls.quote(schema_name), cls.quote(table_name),
+                                                       ', '.join(cls.quote(column) for column in columns))
+        loaded_count = 0
+        for chunk in cls.chunks(rows, chunk_size):
+            cursor.copy_expert(copy_sql, cls.copy_buffer(chunk))
+            loaded_count += len(chunk)
+        return loaded_count
+
+    @classmethod
+    def executemany_to_sqlite(cls, connection, table_name, columns, rows, chunk_size):
+        """
+        INSERT rows into a SQLite table with executemany; one executemany per chunk, all within one transaction.
+        :param connection: sqlite3 connection.
+        :param table_name: Target table.
+        :param columns: Column names; in order of values in rows.
+        :param rows: An iterable of rows.
+        :param chunk_size: Rows per executemany.
+        :return: Number of rows loaded.
+        """
+        insert_sql = 'INSERT INTO {} ({}) VALUES ({})'.format(cls.quote(table_name),
+                                                             ', '.join(cls.quote(column) for column in columns),
+                                                             ', '.join('?' for _ in columns))
+        loaded_count = 0
+        try:
+            for chunk in cls.chunks(rows, chunk_size):
+                connection.executemany(insert_sql, chunk)
+                loaded_count += len(chunk)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return loaded_count
@@ -0,0 +1,110 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import struct
+import zlib
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class CacheCodec(object):
+    """
+    Binary layout of responses cached by PROTON. Each entry is a small fixed header followed by content type, ETag
+    and the response body as is (raw bytes); optionally zlib compressed.
+
+        | version (1) | encoding (1) | expires_at (8) | delta (8) | content type length (2) | ETag length (1) |
+        | content type | ETag | body |
+    """
+
+    VERSION = 2
+    IDENTITY = 0
+    ZLIB = 1
+    __header = struct.Struct('!BBddHB')
+
+    @staticmethod
+    def etag(body):
+        """
+        Content hash of response body; a strong validator for ETag.
+        :param body: Response body; bytes or str.
+        :return: ETag (without quotes)
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    @classmethod
+    def encode(cls, body, content_type, expires_at, delta, compression_threshold=None, compression_level=6,
+               etag=None):
+        """
+        Encode response into a cache entry.
+        :param body: Response body; bytes or str.
+        :param content_type: Content type of the response.
+        :param expires_at: Epoch time at which the entry expires.
+        :param delta: Time in seconds it took to compute the response.
+        :param compression_threshold: Bodies of at least this size (bytes) are zlib compressed. None disables.
+        :param compression_level: zlib compression level.
+        :param etag: ETag of the response. Derived from body if None.
+        :return: cache entry as bytes.
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        etag = (cls.etag(body) if etag is None else etag).encode('utf-8')
+        encoding = cls.IDENTITY
+        if compression_threshold is not None and len(body) >= compression_threshold:
+            compressed_body = zlib.compress(body, compression_level)
+            if len(compressed_body) < len(body):
+                body, encoding = compressed_body, cls.ZLIB
+        content_type = (content_type or '').encode('utf-8')
+        return (cls.__header.pack(cls.VERSION, encoding, expires_at, delta, len(content_type), len(etag)) +
+                content_type + etag + body)
+
+    @classmethod
+    def decode(cls, entry):
+        """
+        Decode a cache entry.
+        :param entry: cache entry as produced by encode.
+        :return: A dictionary of body (bytes), content_type, etag, expires_at & delta. Raises ValueError if entry is not
+        a valid cache entry.
+        """
+        try:
+            version, encoding, expires_at, delta, content_type_length, etag_length = cls.__header.unpack_from(entry)
+        except struct.error:
+            raise ValueError('Cache entry is too short to be decoded.')
+        if version != cls.VERSION:
+            raise ValueError('Unsupported cache entry version: {}'.format(version))
+        offset = cls.__header.size
+        content_type = entry[offset:offset + content_type_length].decode('utf-8')
+        offset += content_type_length
+        etag = entry[offset:offset + etag_length].decode('utf-8')
+        body = entry[offset + etag_length:]
+        if encoding == cls.ZLIB:
+            try:
+                body = zlib.decompress(body)
+            except zlib.error as e:
+                raise ValueError('Cache entry could not be decompressed: {}'.format(e))
+        return {'body': body, 'content_type': content_type, 'etag': etag, 'expires_at': expires_at, 'delta': delta}
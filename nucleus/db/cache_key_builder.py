@@ -0,0 +1,157 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import re
+from urllib.parse import urlencode
+from configuration import ProtonConfig
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class CacheKeyBuilder(ProtonConfig):
+    """
+    Canonical cache keys for responses cached by PROTON. A key is laid out as
+
+        c:<micName>:<HTTP method>:<route>:<user scope>:<query params sorted by name>
+
+    Query params are url encoded; so, separators within values can't produce colliding keys. Keys longer than
+    CACHE_KEY_MAX_LENGTH have their user scope & query params replaced by a SHA-256 digest, while the prefix stays
+    readable for scans per MIC or per route.
+
+    Tags group cache keys by the database tables their responses are read from; laid out as t:<table>. Writes to a
+    table invalidate all keys tagged with it.
+
+    Write markers note recent writes for every worker; laid out as rw:<table>, rw:? for writes to tables not known and
+    rw:* for any write. Reads for which a marker is present stay on primary rather than read replicas.
+    """
+
+    __dml_table_pattern = re.compile(r'\b(?:UPDATE|INSERT\s+INTO|DELETE\s+FROM)\s+(?:ONLY\s+)?([\w."]+)',
+                                     re.IGNORECASE)
+    # FROM is followed by a comma separated list of tables, each optionally aliased; JOIN by a single table.
+    __from_list_pattern = re.compile(r'\bFROM\s+((?:ONLY\s+)?[\w."]+(?:\s+(?:AS\s+)?\w+)?'
+                                     r'(?:\s*,\s*(?:ONLY\s+)?[\w."]+(?:\s+(?:AS\s+)?\w+)?)*)', re.IGNORECASE)
+    __join_pattern = re.compile(r'\bJOIN\s+(?:ONLY\s+)?([\w."]+)', re.IGNORECASE)
+    __table_pattern = re.compile(r'\s*(?:ONLY\s+)?([\w."]+)', re.IGNORECASE)
+
+    @classmethod
+    def prefix(cls, namespace, method=None, route=None):
+        """
+        Prefix shared by all keys of a MIC; or of a route within a MIC.
+        :param namespace: MIC name.
+        :param method: HTTP method.
+        :param route: A valid route.
+        :return: key prefix
+        """
+        key_prefix = 'c:{}:'.format(namespace)
+        if method is not None:
+            key_prefix = key_prefix + '{}:'.format(method.upper())
+            if route is not None:
+                key_prefix = key_prefix + '{}:'.format(route)
+        return key_prefix
+
+    @classmethod
+    def build(cls, namespace, method, route, params, vary_by=None, user_scope=None):
+        """
+        Build cache key.
+        :param namespace: MIC name the route belongs to.
+        :param method: HTTP method.
+        :param route: A valid route.
+        :param params: Query params of the request; a dictionary.
+        :param vary_by: Names of query params that vary the key. None implies all query params.
+        :param user_scope: Identity of the user (JWT encode_value) for user specific responses; None otherwise.
+        :return: cache key
+        """
+        canonical_params = []
+        for name in sorted(params):
+            if vary_by is None or name in vary_by:
+                value = params[name]
+                for item in (value if isinstance(value, (list, tuple)) else [value]):
+                    canonical_params.append((name, item))
+
+        variant = '{}:{}'.format('*' if user_scope is None else urlencode({'u': user_scope}),
+                                 urlencode(canonical_params))
+        key_prefix = cls.prefix(namespace, method, route)
+        if len(key_prefix) + len(variant) > cls.CACHE_KEY_MAX_LENGTH:
+            variant = '#' + hashlib.sha256(variant.encode('utf-8')).hexdigest()
+        return key_prefix + variant
+
+    @staticmethod
+    def tag(table):
+        """
+        Tag for a database table. Schema & quotes are dropped and names are case insensitive; so, the same table
+        always maps to the same tag.
+        :param table: Table name; optionally schema qualified. eg. public."Employee"
+        :return: tag
+        """
+        return 't:{}'.format(table.split('.')[-1].replace('"', '').lower())
+
+    @classmethod
+    def tables_written(cls, sql):
+        """
+        Tables an UPDATE, INSERT or DELETE statement writes to.
+        :param sql: SQL statement or template.
+        :return: A list of table names.
+        """
+        return list(dict.fromkeys(cls.__dml_table_pattern.findall(sql)))
+
+    @classmethod
+    def tables_read(cls, sql):
+        """
+        Tables a SELECT statement reads from; i.e. tables in FROM (including comma separated ones) & JOIN clauses.
+        Tables of sub-queries are included.
+        :param sql: SQL statement or template.
+        :return: A list of table names.
+        """
+        tables = [(match.start(), table) for match in cls.__join_pattern.finditer(sql) for table in match.groups()]
+        for match in cls.__from_list_pattern.finditer(sql):
+            tables.extend((match.start(), cls.__table_pattern.match(item).group(1))
+                          for item in match.group(1).split(','))
+        return list(dict.fromkeys(table for position, table in sorted(tables, key=lambda table: table[0])))
+
+    @classmethod
+    def __write_marker(cls, table):
+        return 'rw:{}'.format(cls.tag(table)[len('t:'):])
+
+    @classmethod
+    def write_markers(cls, tables=None):
+        """
+        Markers a write sets; one per table written to, or rw:? if tables are not known, along with rw:*.
+        :param tables: Tables written to; None or empty if not known.
+        :return: A list of keys.
+        """
+        return [cls.__write_marker(table) for table in tables] + ['rw:*'] if tables else ['rw:?', 'rw:*']
+
+    @classmethod
+    def read_markers(cls, tables=None):
+        """
+        Markers of writes a read must observe; writes to any of the tables read or to tables not known. If tables read
+        are not known, any write.
+        :param tables: Tables read; None or empty if not known.
+        :return: A list of keys.
+        """
+        return [cls.__write_marker(table) for table in tables] + ['rw:?'] if tables else ['rw:*']
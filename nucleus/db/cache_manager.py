@@ -21,10 +21,15 @@
 # SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
 # WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-
 import redis
+import threading
+from collections import OrderedDict
 from configuration import ProtonConfig
+from contextlib import contextmanager
+from nucleus.db.sharded_redis import ShardedRedis
+from nucleus.generics.circuit_breaker import CircuitBreaker, CircuitOpenError
 from nucleus.generics.log_utilities import LogUtilities
+from nucleus.generics.proton_metrics import ProtonMetrics
 
 __author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
 __copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
@@ -35,17 +40,63 @@ __version__ = "1.0"
 class CacheManager(ProtonConfig, LogUtilities):
     """
     CacheManager facilitates redis to support underlying databases supported
-    by PROTON. All redis activities are controlled within CacheManager.
+    by PROTON. All redis activities are controlled within CacheManager; each of them is timed & its errors counted
+    in ProtonMetrics.
+
+    Cache is spread across redis nodes listed in ProtonConfig.REDIS_NODES by consistent hashing of keys. Every node is
+    guarded by a circuit breaker of its own; while it is open, redis activities on that node return right away as
+    though they were unsuccessful. Bulk activities are routed per node; one pipeline per node involved.
     """
-    __redisConfig = {
-        'host': 'redis',
-        'port': 6379,
-        'db': 0
-    }
+    __redis_connection_pools = {}
+    __redis_instance = None
+    __redis_pool_lock = threading.Lock()
+    __redis_circuit_breakers = {}
     cache_manager_logger = LogUtilities().get_logger(log_file_name='cache_manager_logs',
                                                      log_file_path='{}/trace/cache_manager_logs.log'.format(
                                                          ProtonConfig.ROOT_DIR))
 
+    @staticmethod
+    def __node_name(redis_node):
+        return '{}:{}/{}'.format(redis_node['host'], redis_node.get('port', 6379), redis_node.get('db', 0))
+
+    @staticmethod
+    def __version_key(tag):
+        # Version of a tag is held on the node of the tag; i.e. it is always read & bumped along with the tag.
+        return '{}:v'.format(tag)
+
+    @classmethod
+    def __redis_pool(cls, redis_node):
+        """
+        ConnectionPool for a redis node governed by redis-py. One pool per node is maintained per worker process and
+        is shared by all consumers of CacheManager. Pooled connections are health checked by redis-py before they are
+        reused.
+        :param redis_node: A dictionary of host, port & db of the node.
+        :return: redis ConnectionPool
+        """
+        node_name = cls.__node_name(redis_node)
+        if node_name not in CacheManager.__redis_connection_pools:
+            with CacheManager.__redis_pool_lock:
+                if node_name not in CacheManager.__redis_connection_pools:
+                    CacheManager.__redis_connection_pools[node_name] = redis.ConnectionPool(
+                        host=redis_node['host'], port=redis_node.get('port', 6379), db=redis_node.get('db', 0),
+                        max_connections=cls.REDIS_POOL_MAX_CONNECTIONS,
+                        socket_timeout=cls.REDIS_SOCKET_TIMEOUT,
+                        socket_connect_timeout=cls.REDIS_SOCKET_CONNECT_TIMEOUT,
+                        health_check_interval=cls.REDIS_HEALTH_CHECK_INTERVAL)
+                    cls.cache_manager_logger.info(
+                        '[CacheManager]: Redis pool for {} is initialized with {} max connections.'.format(
+                            node_name, cls.REDIS_POOL_MAX_CONNECTIONS))
+        return CacheManager.__redis_connection_pools[node_name]
+
+    @classmethod
+    def __circuit_breaker(cls, node):
+        if node not in CacheManager.__redis_circuit_breakers:
+            with CacheManager.__redis_pool_lock:
+                CacheManager.__redis_circuit_breakers.setdefault(node, CircuitBreaker(
+                    'redis:{}'.format(node), cls.REDIS_BREAKER_FAILURE_THRESHOLD, cls.REDIS_BREAKER_RESET_TIMEOUT,
+                    cls.REDIS_BREAKER_MAX_RESET_TIMEOUT))
+        return CacheManager.__redis_circuit_breakers[node]
+
     @classmethod
     def cache_processor(cls):
         """
@@ -54,33 +105,245 @@ class CacheManager(ProtonConfig, LogUtilities):
         :return: A dictionary of all methods processed by CacheManager.
         """
 
+        @contextmanager
+        def redis_command(command, node):
+            """
+            Guard a redis command (or a pipeline of them) with circuit breaker of the node and record its metrics.
+            Connection failures & timeouts count towards opening the circuit; any response from redis closes it.
+            :param command: Name of redis command.
+            :param node: Name of redis node the command is sent to.
+            :return: context manager; raises CircuitOpenError without calling redis while circuit is open.
+            """
+            breaker = cls.__circuit_breaker(node)
+            if not breaker.allow_request():
+                raise CircuitOpenError('Circuit for redis node {} is open.'.format(node))
+            try:
+                with ProtonMetrics.redis_command(command):
+                    yield
+            except (redis.ConnectionError, redis.TimeoutError):
+                breaker.record_failure()
+                raise
+            except Exception:
+                breaker.record_success()
+                raise
+            breaker.record_success()
+
+        def on_nodes(redis_instance, command, groups, operation):
+            """
+            Run operation for each node on its group of items. Nodes are independent of each other; a node whose
+            circuit is open or which fails is skipped while others carry on.
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache.
+            :param command: Name of redis command.
+            :param groups: A dictionary of node name to items meant for the node.
+            :param operation: Callable accepting redis client of a node & its items.
+            :return: A dictionary of node name to result of operation; nodes that were skipped are absent.
+            """
+            results = {}
+            for node, items in groups.items():
+                try:
+                    with redis_command(command, node):
+                        results[node] = operation(redis_instance.client(node), items)
+                except CircuitOpenError:
+                    continue
+                except Exception as e:
+                    cls.cache_manager_logger.exception('Redis command {} on node {} is unsuccessful. '
+                                                       'Details: {}'.format(command, node, str(e)))
+            return results
+
+        def cache_available(redis_instance, key=None):
+            """
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache.
+            :param key: A valid key. None implies any node.
+            :return: Bool indicating if redis node of the key is worth a try; False while its circuit is open.
+            """
+            nodes = redis_instance.nodes if key is None else [redis_instance.node(key)]
+            return any(cls.__circuit_breaker(node).available() for node in nodes)
+
+        def batches(keys):
+            for index in range(0, len(keys), cls.REDIS_BULK_BATCH_SIZE):
+                yield keys[index:index + cls.REDIS_BULK_BATCH_SIZE]
+
+        def unlink_keys(client, keys):
+            """
+            UNLINK keys of a node in batches within a single pipeline. Memory is reclaimed by redis in background; so,
+            large values don't block redis the way DEL would.
+            :return: Number of keys unlinked.
+            """
+            if not keys:
+                return 0
+            with client.pipeline(transaction=False) as pipe:
+                for batch in batches(keys):
+                    pipe.unlink(*batch)
+                return sum(pipe.execute())
+
         def instantiate_cache():
             """
-            Instantiates redis instance.
+            Instantiates redis instance; i.e. clients of all redis nodes. The instance is created once per process and
+            borrows connections from shared redis pools; so, calling this repeatedly is cheap.
             :return: redis_instance object.
             """
             try:
-                redis_instance = redis.StrictRedis(host=cls.__redisConfig['host'], port=cls.__redisConfig['port'],
-                                                   db=cls.__redisConfig['db'])
-                cls.cache_manager_logger.info('Successfully instantiated cache!')
-                return redis_instance
+                if CacheManager.__redis_instance is None:
+                    CacheManager.__redis_instance = ShardedRedis(
+                        OrderedDict((cls.__node_name(redis_node),
+                                     redis.StrictRedis(connection_pool=cls.__redis_pool(redis_node)))
+                                    for redis_node in cls.REDIS_NODES), cls.REDIS_VIRTUAL_NODES)
+                    cls.cache_manager_logger.info('Successfully instantiated cache across {} redis nodes!'.format(
+                        len(cls.REDIS_NODES)))
+                return CacheManager.__redis_instance
             except Exception as e:
                 cls.cache_manager_logger.exception('Exception while instantiating cache. Details: {}'.format(str(e)))
 
-        def set_to_cache(redis_instance, key, value):
+        def set_to_cache(redis_instance, key, value, lifespan=None):
             """
             Set value to cache.
             :param redis_instance: A valid redis_instance as provided by instantiate_cache.
             :param key: The key
             :param value: The value
+            :param lifespan: Time to live in seconds. Redis expires the key on its own once this elapses. None implies
+            the key never expires.
             :return: void
             """
             try:
-                redis_instance.set(key, value)
-                cls.cache_manager_logger.info('Cache set for key: {}'.format(key))
+                node = redis_instance.node(key)
+                with redis_command('set', node):
+                    redis_instance.client(node).set(key, value, ex=lifespan)
+                cls.cache_manager_logger.info('Cache set for key: {} with lifespan: {}'.format(key, lifespan))
+            except CircuitOpenError:
+                return
             except Exception as e:
                 cls.cache_manager_logger.exception('Exception while setting value to cache. Details: {}'.format(str(e)))
 
+        def get_tag_versions_from_cache(redis_instance, tags):
+            """
+            Versions of tags. Version of a tag is bumped every time the tag is invalidated; so, a response computed
+            before a write to its tables can be told apart from one computed after. Read versions of tags before
+            computing a response and set it with set_many_with_tags_to_cache along with those versions.
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache.
+            :param tags: A list of tags as built by CacheKeyBuilder.tag.
+            :return: A dictionary of tag to version; tags whose node is unavailable are absent. None on failure.
+            """
+            try:
+                tag_versions = {}
+
+                def get_versions(client, group):
+                    versions = client.mget([cls.__version_key(tag) for index, tag in group])
+                    for (index, tag), version in zip(group, versions):
+                        tag_versions[tag] = int(version or 0)
+
+                on_nodes(redis_instance, 'tag_versions', redis_instance.group(list(tags)), get_versions)
+                return tag_versions
+            except Exception as e:
+                cls.cache_manager_logger.exception('Exception while getting versions of tags {}. Details: {}'.format(
+                    tags, str(e)))
+
+        def set_many_with_tags_to_cache(redis_instance, entries):
+            """
+            Set values to cache and add their keys to the set of each of their tags. Sets of tags are kept alive for at
+            least as long as values tagged with them. Tags may live on other nodes than values; so, sets of tags are
+            updated first and a value is set only if all its tags are updated. A value is thus never left in cache
+            without means to invalidate it.
+
+            An entry may carry versions of its tags as read (get_tag_versions_from_cache) before its value was
+            computed. Such an entry is set only if none of its tags is invalidated since; versions are checked while
+            its key is added to sets of tags, and once more after values are set, in which case values invalidated
+            meanwhile are deleted. A value computed before a write is thus never left in cache after the write.
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache.
+            :param entries: A list of (key, value, lifespan, tags) or (key, value, lifespan, tags, tag_versions)
+            tuples. Lifespan is time to live in seconds; tags is a list of tags as built by CacheKeyBuilder.tag,
+            possibly empty; tag_versions is a dictionary of tag to version, or None to set the entry regardless.
+            :return: void
+            """
+            try:
+                tag_members = OrderedDict()
+                tag_lifespans = {}
+                for index, entry in enumerate(entries):
+                    for tag in entry[3]:
+                        tag_members.setdefault(tag, []).append(index)
+                        tag_lifespans[tag] = max(tag_lifespans.get(tag, 0), entry[2] or 0)
+
+                def expected_version(index, tag):
+                    tag_versions = entries[index][4] if len(entries[index]) > 4 else None
+                    return None if tag_versions is None else tag_versions.get(tag, -1)
+
+                def stale_members(tags, versions):
+                    return [(tag, index) for tag, version in zip(tags, versions) for index in tag_members[tag]
+                            if expected_version(index, tag) not in (None, int(version or 0))]
+
+                def tag_keys(client, tags):
+                    version_keys = [cls.__version_key(tag) for tag in tags]
+                    with client.pipeline() as pipe:
+                        while True:
+                            try:
+                                # Tags must not be invalidated between checking their versions and adding keys.
+                                pipe.watch(*version_keys)
+                                stale = set(stale_members(tags, pipe.mget(version_keys)))
+                                accepted = [(tag, index) for tag in tags for index in tag_members[tag]
+                                            if (tag, index) not in stale]
+                                pipe.multi()
+                                for tag in tags:
+                                    members = [entries[index][0] for index in tag_members[tag]
+                                               if (tag, index) not in stale]
+                                    if members:
+                                        pipe.sadd(tag, *members)
+                                for tag in tags:
+                                    pipe.ttl(tag)
+                                current_tag_lifespans = pipe.execute()[-len(tags):]
+                                break
+                            except redis.WatchError:
+                                continue
+                    tags_to_extend = [tag for tag, current_lifespan in zip(tags, current_tag_lifespans)
+                                      if tag_lifespans[tag] and current_lifespan < tag_lifespans[tag]]
+                    if tags_to_extend:
+                        with client.pipeline(transaction=False) as pipe:
+                            for tag in tags_to_extend:
+                                pipe.expire(tag, tag_lifespans[tag])
+                            pipe.execute()
+                    return accepted
+
+                tag_groups = OrderedDict((node, [tag for index, tag in group])
+                                         for node, group in redis_instance.group(list(tag_members)).items())
+                tagged_nodes = on_nodes(redis_instance, 'tag', tag_groups, tag_keys)
+                accepted = set(member for node_accepted in tagged_nodes.values() for member in node_accepted)
+
+                def set_values(client, group):
+                    with client.pipeline(transaction=False) as pipe:
+                        for index, key in group:
+                            pipe.set(key, entries[index][1], ex=entries[index][2])
+                        pipe.execute()
+
+                settable = [index for index, entry in enumerate(entries)
+                            if all((tag, index) in accepted for tag in entry[3])]
+                value_groups = OrderedDict((node, [(settable[position], key) for position, key in group])
+                                           for node, group in redis_instance.group(
+                                               [entries[index][0] for index in settable]).items())
+                set_nodes = on_nodes(redis_instance, 'set_many', value_groups, set_values)
+
+                # Tags invalidated after keys were added to them but before values were set; values are stale.
+                versioned_tags = list(OrderedDict.fromkeys(
+                    tag for node in set_nodes for index, key in value_groups[node] for tag in entries[index][3]
+                    if expected_version(index, tag) is not None))
+
+                def get_stale(client, group):
+                    tags = [tag for index, tag in group]
+                    return stale_members(tags, client.mget([cls.__version_key(tag) for tag in tags]))
+
+                set_indices = set(index for node in set_nodes for index, key in value_groups[node])
+                stale_keys = list(OrderedDict.fromkeys(
+                    entries[index][0] for node_stale in on_nodes(redis_instance, 'tag_versions',
+                                                                 redis_instance.group(versioned_tags),
+                                                                 get_stale).values()
+                    for tag, index in node_stale if index in set_indices))
+                if stale_keys:
+                    key_groups = OrderedDict((node, [key for index, key in group])
+                                             for node, group in redis_instance.group(stale_keys).items())
+                    on_nodes(redis_instance, 'unlink', key_groups, unlink_keys)
+                cls.cache_manager_logger.info('Cache set for {} of {} keys with tags: {}'.format(
+                    len(set_indices) - len(stale_keys), len(entries), list(tag_members)))
+            except Exception as e:
+                cls.cache_manager_logger.exception('Exception while setting values to cache. Details: {}'.format(
+                    str(e)))
+
         def get_from_cache(redis_instance, key):
             """
             Getter function to extract data from cache.
@@ -89,23 +352,87 @@ class CacheManager(ProtonConfig, LogUtilities):
             :return: Data from cache.
             """
             try:
-                data_from_cache = redis_instance.get(key)
+                node = redis_instance.node(key)
+                with redis_command('get', node):
+                    data_from_cache = redis_instance.client(node).get(key)
                 cls.cache_manager_logger.info('Data from cache successful for key: {}'.format(key))
                 return data_from_cache
+            except CircuitOpenError:
+                return None
             except Exception as e:
                 cls.cache_manager_logger.exception(
                     'Data from cache for key: {} is unsuccessful. Details: {}'.format(key, str(e)))
 
+        def get_many_from_cache(redis_instance, keys):
+            """
+            Bulk getter. Keys are fetched with MGET in batches within a single pipeline per node; i.e. one round trip
+            per node.
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache
+            :param keys: A list of valid keys.
+            :return: A list of data from cache in the order of keys; None for keys not in cache or whose node is
+            unavailable. None on failure.
+            """
+            try:
+                keys = list(keys)
+                data_from_cache = [None] * len(keys)
+
+                def mget(client, group):
+                    with client.pipeline(transaction=False) as pipe:
+                        for batch in batches(group):
+                            pipe.mget([key for index, key in batch])
+                        for batch, batch_data in zip(batches(group), pipe.execute()):
+                            for (index, key), data in zip(batch, batch_data):
+                                data_from_cache[index] = data
+
+                on_nodes(redis_instance, 'mget', redis_instance.group(keys), mget)
+                cls.cache_manager_logger.info('Data from cache successful for {} keys'.format(len(keys)))
+                return data_from_cache
+            except Exception as e:
+                cls.cache_manager_logger.exception(
+                    'Data from cache for {} keys is unsuccessful. Details: {}'.format(len(keys), str(e)))
+
+        def set_many_to_cache(redis_instance, items, lifespan=None):
+            """
+            Bulk setter. SET with lifespan is pipelined per node; i.e. one round trip per REDIS_BULK_BATCH_SIZE items
+            of a node.
+            :param redis_instance: A valid redis_instance as provided by instantiate_cache.
+            :param items: A list of (key, value) tuples; or a dictionary of key to value.
+            :param lifespan: Time to live in seconds for every item. None implies items never expire.
+            :return: A list of Bool in the order of items; None on failure.
+            """
+            try:
+                items = list(items.items() if isinstance(items, dict) else items)
+                set_status = [False] * len(items)
+
+                def set_many(client, group):
+                    with client.pipeline(transaction=False) as pipe:
+                        for batch in batches(group):
+                            for index, key in batch:
+                                pipe.set(key, items[index][1], ex=lifespan)
+                            for (index, key), status in zip(batch, pipe.execute()):
+                                set_status[index] = bool(status)
+
+                on_nodes(redis_instance, 'set_many', redis_instance.group([key for key, value in items]), set_many)
+                cls.cache_manager_logger.info('Cache set for {} keys with lifespan: {}'.format(len(items), lifespan))
+                return set_status
+            except Exception as e:
+                cls.cache_manager_logger.exception('Exception while setting values to cache. Details: {}'.format(
+                    str(e)))
+
         def ping_cache(redis_instance):
             """
             Function to check if redis is available.
             :param redis_instance: A valid redis_instance as provided by instantiate_cache
-            :return: Bool
+            :return: Bool; True only if all redis nodes are available.
             """
             try:
-                redis_instance.ping()
+                for node in redis_instance.nodes:
+                    with redis_command('ping', node):
+                        redis_instance.client(node).ping()
                 cls.cache_manager_logger.info('Redis instance is available!')
                 return True
+            except CircuitOpenError:
+                return False
             except Exception as e:
                 cls.cache_manager_logger.exception(
                     'Redis instance is unavailable on ping!. Details : {}'.format(str(e)))
@@ -119,18 +446,120 @@ class CacheManager(ProtonConfig, LogUtilities):
             :return: Bool
             """
             try:
-                redis_instance.delete(key)
+                node = redis_instance.node(key)
+                with redis_command('delete', node):
+                    redis_instance.client(node).delete(key)
                 cls.cache_manager_logger.info('{} deleted from Redis cache!'.format(key))
                 return True
+            except CircuitOpenError:
+                return False
             except Exception as e:
                 cls.cache_manager_logger.exception(('Redis instance is unavailable to delete key: {}. '
                                                     'Details: {}'.format(key, str(e))))
                 return False
 
+        def delete_many_from_cache(redis_instance, keys):
+            """
+            Bulk delete. Keys are UNLINKed within a single pipeline per node; i.e. one round trip per node.
+            :param redis_instance: A valid redis instance as provided by instantiate_cache.
+            :param keys: A list of valid keys.
+            :return: A list of Bool in the order of keys indicating if respective key was present; None on failure.
+            """
+            try:
+                keys = list(keys)
+                deleted_status = [False] * len(keys)
+
+                def unlink(client, group):
+                    with client.pipeline(transaction=False) as pipe:
+                        for index, key in group:
+                            pipe.unlink(key)
+                        for (index, key), status in zip(group, pipe.execute()):
+                            deleted_status[index] = bool(status)
+
+                on_nodes(redis_instance, 'unlink', redis_instance.group(keys), unlink)
+                cls.cache_manager_logger.info('{} of {} keys deleted from Redis cache!'.format(sum(deleted_status),
+                                                                                              len(keys)))
+                return deleted_status
+            except Exception as e:
+                cls.cache_manager_logger.exception(('Redis instance is unavailable to delete {} keys. '
+                                                    'Details: {}'.format(len(keys), str(e))))
+
+        def delete_by_prefix_from_cache(redis_instance, prefix):
+            """
+            Delete all entries whose keys begin with given prefix; on every node. Keys are scanned incrementally; so,
+            redis is not blocked the way it would be with KEYS. Scanned keys are UNLINKed a batch at a time.
+            :param redis_instance: A valid redis instance as provided by instantiate_cache.
+            :param prefix: A valid key prefix.
+            :return: Number of entries deleted; None on failure.
+            """
+            try:
+                def delete_by_prefix(client, node_prefix):
+                    deleted_count = 0
+                    batch = []
+                    for key in client.scan_iter(match='{}*'.format(node_prefix), count=cls.REDIS_BULK_BATCH_SIZE):
+                        batch.append(key)
+                        if len(batch) == cls.REDIS_BULK_BATCH_SIZE:
+                            deleted_count += unlink_keys(client, batch)
+                            batch = []
+                    return deleted_count + unlink_keys(client, batch)
+
+                deleted_count = sum(on_nodes(redis_instance, 'delete_by_prefix',
+                                             OrderedDict((node, prefix) for node in redis_instance.nodes),
+                                             delete_by_prefix).values())
+                cls.cache_manager_logger.info('{} entries with prefix {} deleted from Redis cache!'.format(
+                    deleted_count, prefix))
+                return deleted_count
+            except Exception as e:
+                cls.cache_manager_logger.exception(('Redis instance is unavailable to delete keys with prefix: {}. '
+                                                    'Details: {}'.format(prefix, str(e))))
+
+        def invalidate_tags_from_cache(redis_instance, tags):
+            """
+            Delete all entries tagged with any of the given tags. Sets of tags are read & cleared, and versions of tags
+            bumped, atomically on nodes they live on; tagged keys are then UNLINKed in batches within one pipeline per
+            node. i.e. two round trips per node involved regardless of number of keys.
+            :param redis_instance: A valid redis instance as provided by instantiate_cache.
+            :param tags: A list of tags as built by CacheKeyBuilder.tag.
+            :return: Number of entries deleted; None on failure.
+            """
+            try:
+                if not tags:
+                    return 0
+
+                def read_and_clear(client, group):
+                    with client.pipeline() as pipe:
+                        # Versions are bumped along with clearing tags; responses computed before now can't be set.
+                        for index, tag in group:
+                            pipe.incr(cls.__version_key(tag))
+                        for index, tag in group:
+                            pipe.smembers(tag)
+                        pipe.delete(*[tag for index, tag in group])
+                        return set().union(*pipe.execute()[len(group):-1])
+
+                tagged_keys = set().union(*on_nodes(redis_instance, 'invalidate_tags', redis_instance.group(tags),
+                                                    read_and_clear).values())
+                key_groups = OrderedDict((node, [key for index, key in group])
+                                         for node, group in redis_instance.group(list(tagged_keys)).items())
+                deleted_count = sum(on_nodes(redis_instance, 'unlink', key_groups, unlink_keys).values())
+                cls.cache_manager_logger.info('{} entries tagged with {} deleted from Redis cache!'.format(
+                    deleted_count, tags))
+                return deleted_count
+            except Exception as e:
+                cls.cache_manager_logger.exception(('Redis instance is unavailable to delete entries tagged with: {}. '
+                                                    'Details: {}'.format(tags, str(e))))
+
         return {
             'init_cache': instantiate_cache,
+            'cache_available': cache_available,
             'set_to_cache': set_to_cache,
+            'set_many_with_tags_to_cache': set_many_with_tags_to_cache,
+            'get_tag_versions_from_cache': get_tag_versions_from_cache,
             'get_from_cache': get_from_cache,
+            'set_many_to_cache': set_many_to_cache,
+            'get_many_from_cache': get_many_from_cache,
+            'delete_many_from_cache': delete_many_from_cache,
             'ping_cache': ping_cache,
-            'delete_from_cache': delete_from_cache
+            'delete_from_cache': delete_from_cache,
+            'delete_by_prefix_from_cache': delete_by_prefix_from_cache,
+            'invalidate_tags_from_cache': invalidate_tags_from_cache
         }
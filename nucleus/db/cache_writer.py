@@ -0,0 +1,112 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import queue
+import threading
+from nucleus.generics.proton_metrics import ProtonMetrics
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class CacheWriter(object):
+    """
+    Takes cache writes off request path. Writes are queued in a bounded queue and are drained by a background thread
+    which hands them over to flush in batches; so, a flush can pipeline an entire batch in a single round trip.
+
+    Writes submitted while queue is full are dropped. Cache is best effort; a dropped write only means the next
+    request for that entry is serviced by conventional PROTON stack.
+    """
+
+    def __init__(self, flush, max_queue_size, batch_size, logger=None):
+        """
+        :param flush: Callable accepting a list of writes. Exceptions raised by flush are logged & swallowed.
+        :param max_queue_size: Maximum number of writes waiting to be flushed.
+        :param batch_size: Maximum number of writes handed over to a single flush.
+        :param logger: Logger for unsuccessful flushes.
+        """
+        super(CacheWriter, self).__init__()
+        self.batch_size = batch_size
+        self.__flush = flush
+        self.__logger = logger
+        self.__queue = queue.Queue(maxsize=max_queue_size)
+        self.__lock = threading.Lock()
+        self.__writer = None
+        self.__writer_pid = None
+
+    def __ensure_writer(self):
+        # Writer thread is started lazily and restarted in a forked worker, as threads don't survive fork.
+        if self.__writer_pid != os.getpid():
+            with self.__lock:
+                if self.__writer_pid != os.getpid():
+                    self.__writer = threading.Thread(target=self.__drain, name='proton-cache-writer', daemon=True)
+                    self.__writer.start()
+                    self.__writer_pid = os.getpid()
+
+    def submit(self, write):
+        """
+        Queue a write without blocking.
+        :param write: A write as understood by flush.
+        :return: Bool indicating if write is queued; False if it is dropped as queue is full.
+        """
+        self.__ensure_writer()
+        try:
+            self.__queue.put_nowait(write)
+            return True
+        except queue.Full:
+            ProtonMetrics.cache_writes_dropped.inc()
+            return False
+
+    def pending(self):
+        """
+        :return: Number of writes waiting to be flushed.
+        """
+        return self.__queue.qsize()
+
+    def join(self):
+        """
+        Block until all queued writes are flushed.
+        :return: void
+        """
+        self.__queue.join()
+
+    def __drain(self):
+        while True:
+            writes = [self.__queue.get()]
+            while len(writes) < self.batch_size:
+                try:
+                    writes.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.__flush(writes)
+            except Exception as e:
+                if self.__logger is not None:
+                    self.__logger.exception('[CacheWriter]: {} cache writes could not be flushed. '
+                                            'Details: {}'.format(len(writes), str(e)))
+            finally:
+                for _ in writes:
+                    self.__queue.task_done()
@@ -86,3 +86,33 @@ class ConnectionDialects(ProtonConfig, LogUtilities):
 
         list(map(lambda sdb: get_parsed_parameters(db, sdb), supported_databases))
         return db
+
+    @classmethod
+    def replica_store(cls, dialect='postgresql'):
+        """
+        Parse config file for read replicas of a db. Replicas are declared as [<dialect>_replica_<n>] sections; eg.
+
+            [postgresql_replica_1]
+            host=pg-replica-1
+            weight=2
+
+        Parameters not given by a replica (database, user, password, port & pool_*) are those of the primary.
+        weight (default 1) is the share of reads relative to other replicas.
+        :param dialect: supported db dialect by PROTON.
+        :return: A list of dictionaries; one per replica, named by its section.
+        """
+        parser = ConfigParser()
+        parser.read('{}/databaseConfig.ini'.format(ProtonConfig.ROOT_DIR))
+        primary = dict(parser.items(dialect)) if parser.has_section(dialect) else {}
+        replicas = []
+        for section in sorted(parser.sections()):
+            if section.startswith('{}_replica'.format(dialect)):
+                replica = dict(primary, weight='1')
+                replica.update(parser.items(section))
+                replica['name'] = section
+                replicas.append(replica)
+        if replicas:
+            cls.connection_dialects_logger.info(
+                '[ConnectionDialects]: {} read replicas of {} found in "databaseConfig.ini" '
+                'file.'.format(len(replicas), dialect))
+        return replicas
@@ -24,14 +24,20 @@
 
 from contextlib import contextmanager
 from configuration import ProtonConfig
-from psycopg2.pool import SimpleConnectionPool
-from sqlalchemy import create_engine, schema
+from sqlalchemy import create_engine, MetaData, schema
+from sqlalchemy.exc import InvalidRequestError, NoSuchTableError
 from sqlalchemy.pool import QueuePool
 from nucleus.db.connection_dialects import ConnectionDialects
+from nucleus.db.cache_key_builder import CacheKeyBuilder
+from nucleus.db.connection_pool import ConnectionPool, PoolTimeoutError
+from nucleus.db.replica_router import ReplicaRouter
+from nucleus.db.sqlite_connections import SQLiteConnections
 from nucleus.generics.log_utilities import LogUtilities
 from nucleus.generics.singleton import Singleton
-import sqlite3
+import psycopg2
 import os
+import re
+import threading
 
 __author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
 __copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
@@ -51,7 +57,13 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
     __alchemy_connection_strings = {}
     __alchemy_engine_store = {}
     __pg_connection_pool = None
-    __sqlite_connection = {}
+    __pg_replica_router = None
+    __sqlite_connections = {}
+    # Catalog metadata is cached process wide; schemas known to exist & MetaData of reflected tables per schema.
+    __known_schemas = set()
+    __metadata_store = {}
+    __metadata_lock = threading.RLock()
+    __ddl = re.compile(r'^\s*(CREATE|ALTER|DROP|RENAME)\b', re.IGNORECASE)
 
     connection_manager_logger = LogUtilities().get_logger(log_file_name='connection_manager_logs',
                                                           log_file_path='{}/trace/connection_manager_logs.log'.format(
@@ -62,41 +74,64 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
         self.pg_cursor_generator = self.__pg_cursor_generator
 
     @classmethod
-    def sqlite_connection_generator(cls):
-        if not bool(cls.__sqlite_connection):
+    def sqlite_connection_generator(cls, read_only=False):
+        """
+        SQLite connection of current thread. Connections are held per thread (and per greenlet under gevent) and are
+        reused by subsequent calls from the same thread; callers must not close them.
+        :param read_only: Connection for getters; read-only connections read concurrently in WAL mode.
+        :return: sqlite3 connection
+        """
+        if read_only not in cls.__sqlite_connections:
             try:
                 with open('{}/proton_vars/proton_sqlite_config.txt'.format(ProtonConfig.ROOT_DIR)) as file:
                     dialect = file.read().replace('\n', '')
-                    cls.__sqlite_connection = sqlite3.connect(dialect)
-                    cls.connection_manager_logger.info(
-                        '[connection_manager]: SQLITE connection generator invoked for the first time. '
-                        'Connection successfully generated and maintained at class level.')
+                cls.__sqlite_connections.setdefault(read_only, SQLiteConnections(
+                    dialect, read_only=read_only, journal_mode=ProtonConfig.SQLITE_JOURNAL_MODE,
+                    synchronous=ProtonConfig.SQLITE_SYNCHRONOUS, cache_size=ProtonConfig.SQLITE_CACHE_SIZE,
+                    mmap_size=ProtonConfig.SQLITE_MMAP_SIZE, busy_timeout=ProtonConfig.SQLITE_BUSY_TIMEOUT))
+                cls.connection_manager_logger.info(
+                    '[connection_manager]: SQLITE connection generator invoked for the first time. '
+                    '{} connections will be maintained per thread.'.format('Read-only' if read_only else 'Read-write'))
             except Exception as e:
                 cls.connection_manager_logger.exception(
                     '[connection_manager]: SQLite connection could not be established. Stack trace to follow.')
                 cls.connection_manager_logger.error(str(e))
-        else:
-            cls.connection_manager_logger.info(
-                '[connection_manager]: SQLITE connection manager is called subsequently. '
-                'Connection previously generated will be reused.')
-        return cls.__sqlite_connection
+                raise
+        return cls.__sqlite_connections[read_only].connection()
+
+    @staticmethod
+    def __new_pg_pool(connection_dialect, name, min_size=None):
+        """
+        ConnectionPool for a postgres section of databaseConfig.ini; primary or replica.
+        :param connection_dialect: Parsed section.
+        :param name: Name of pool; labels metrics.
+        :param min_size: Connections opened upfront; pool_min_size of section if None.
+        :return: ConnectionPool
+        """
+        dsn = "dbname='{}' user='{}' host='{}' password='{}' port='{}'".format(connection_dialect['database'],
+                                                                               connection_dialect['user'],
+                                                                               connection_dialect['host'],
+                                                                               connection_dialect['password'],
+                                                                               connection_dialect['port'])
+        if min_size is None:
+            min_size = int(connection_dialect.get('pool_min_size', 1))
+        return ConnectionPool(lambda: psycopg2.connect(dsn=dsn), min_size=min_size,
+                              max_size=int(connection_dialect.get('pool_max_size', 25)),
+                              max_overflow=int(connection_dialect.get('pool_max_overflow', 5)),
+                              timeout=float(connection_dialect.get('pool_timeout', 30)),
+                              name=name)
 
     @classmethod
     def __pg_pool(cls):
         """
-        ConnectionPool for Postgres governed by psycopg2.
+        ConnectionPool for Postgres; safe to share across threads & greenlets. Pool is sized by pool_min_size,
+        pool_max_size, pool_max_overflow & pool_timeout (seconds a checkout waits once pool is exhausted) in
+        postgresql section of databaseConfig.ini.
         :return:
         """
         if cls.__pg_connection_pool is None:
             try:
-                connection_dialect = cls.__connection_dialects['postgresql']
-                dsn = "dbname='{}' user='{}' host='{}' password='{}' port='{}'".format(connection_dialect['database'],
-                                                                                       connection_dialect['user'],
-                                                                                       connection_dialect['host'],
-                                                                                       connection_dialect['password'],
-                                                                                       connection_dialect['port'])
-                # connection_pool with 25 live connections. Tweak this according to convenience.
-                cls.__pg_connection_pool = SimpleConnectionPool(1, 25, dsn=dsn)
+                cls.__pg_connection_pool = cls.__new_pg_pool(cls.__connection_dialects['postgresql'], 'postgresql')
                 cls.connection_manager_logger.info(
                     '[connection_manager]: PG Pool class method is invoked for first time. '
                     'PG Pool will be initialized for Postgres engine of PROTON.')
@@ -111,14 +146,123 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
 
         return cls.__pg_connection_pool
 
+    @classmethod
+    def __pg_replicas(cls):
+        """
+        ReplicaRouter over read replicas of Postgres; one ConnectionPool per replica. Router has no replicas if none
+        are declared in databaseConfig.ini; in which case all reads are served by primary.
+        :return: ReplicaRouter
+        """
+        if cls.__pg_replica_router is None:
+            replicas = []
+            unreachable = []
+            for connection_dialect in cls.replica_store('postgresql'):
+                name = connection_dialect['name']
+                try:
+                    pool = cls.__new_pg_pool(connection_dialect, name)
+                except Exception as e:
+                    # Replica joins rotation once it is reachable; it is retried after REPLICA_RETRY_INTERVAL.
+                    cls.connection_manager_logger.exception(
+                        '[connection_manager]: Read replica {} is unreachable. Stack trace to follow.'.format(name))
+                    cls.connection_manager_logger.error(str(e))
+                    pool = cls.__new_pg_pool(connection_dialect, name, min_size=0)
+                    unreachable.append(name)
+                replicas.append({'name': name, 'pool': pool, 'weight': connection_dialect['weight']})
+
+            replica_router = ReplicaRouter(replicas, strategy=ProtonConfig.REPLICA_LOAD_BALANCING,
+                                           read_after_write_window=ProtonConfig.REPLICA_READ_AFTER_WRITE_WINDOW,
+                                           retry_interval=ProtonConfig.REPLICA_RETRY_INTERVAL)
+            for name in unreachable:
+                replica_router.mark_down(replica_router.replica(name))
+            cls.__pg_replica_router = replica_router
+            cls.connection_manager_logger.info(
+                '[connection_manager]: Reads of Postgres are routed across {} read replicas by '
+                '{}.'.format(len(replica_router), replica_router.strategy))
+        return cls.__pg_replica_router
+
+    @staticmethod
+    def __open_pg_cursor(connection, name=None):
+        # Named cursors are server side; rows are transferred as they are fetched rather than all at once.
+        return connection.cursor(name=name) if name else connection.cursor()
+
+    @staticmethod
+    def __return_pg_connection(connection_pool, connection):
+        """
+        Return connection to its pool.
+        :return: Bool indicating if connection is broken; broken connections are closed rather than reused.
+        """
+        broken = bool(connection.closed)
+        if not broken and connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            # Uncommitted work must not leak into the next checkout of this connection.
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+        connection_pool.putconn(connection, close=broken)
+        return broken
+
     @classmethod
     @contextmanager
-    def __pg_cursor(cls, connection_pool):
+    def __pg_cursor(cls, connection_pool, name=None):
         connection = connection_pool.getconn()
         try:
-            yield connection.cursor()
+            yield cls.__open_pg_cursor(connection, name)
+        finally:
+            cls.__return_pg_connection(connection_pool, connection)
+
+    @classmethod
+    @contextmanager
+    def __pg_read_cursor(cls, replica_router, connection_pool, name=None, tables=None):
+        """
+        Cursor for reads. Cursor is of a replica picked by replica_router; or of primary if tables are written to
+        recently or no replica is available.
+        :param tables: Tables read; None if not known.
+        """
+        replica = replica_router.acquire(cls.__table_tags(tables)) if replica_router is not None else None
+        connection = None
+        if replica is not None:
+            try:
+                connection = replica['pool'].getconn()
+            except Exception as e:
+                # An exhausted replica pool is busy, not unhealthy; it stays in rotation.
+                replica_router.release(replica, failed=not isinstance(e, PoolTimeoutError))
+                cls.connection_manager_logger.error(
+                    '[connection_manager]: Read replica {} is unavailable; read is served by primary. '
+                    'Details: {}'.format(replica['name'], str(e)))
+                replica = None
+
+        if replica is None:
+            with cls.__pg_cursor(connection_pool, name) as cursor:
+                yield cursor
+            return
+
+        try:
+            yield cls.__open_pg_cursor(connection, name)
         finally:
-            connection_pool.putconn(connection)
+            replica_router.release(replica, failed=cls.__return_pg_connection(replica['pool'], connection))
+
+    @staticmethod
+    def __table_tags(tables):
+        return [CacheKeyBuilder.tag(table) for table in tables] if tables else None
+
+    @classmethod
+    def replicas_enabled(cls):
+        """
+        :return: Bool indicating if reads of Postgres are routed across read replicas.
+        """
+        return cls.__pg_replica_router is not None and len(cls.__pg_replica_router) > 0
+
+    @classmethod
+    def record_write(cls, tables=None):
+        """
+        Record a committed write to Postgres. Reads of these tables within this worker are served by primary for
+        REPLICA_READ_AFTER_WRITE_WINDOW seconds; so, they are not served stale rows by a lagging replica. Other workers
+        learn of the write through write markers in redis; see CacheKeyBuilder.write_markers.
+        :param tables: Tables written to; None if not known, in which case all reads stay on primary.
+        :return: void
+        """
+        if cls.__pg_replica_router is not None:
+            cls.__pg_replica_router.record_write(cls.__table_tags(tables))
 
     @classmethod
     def alchemy_engine(cls):
@@ -202,7 +346,9 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
                 '[connection_manager]: Postgres operational. PROTON will successfully include PG!')
             connection_manager.update({'postgresql': {
                 'getCursor': cls.__pg_cursor,
-                'pool': pg_connection_pool
+                'getReadCursor': cls.__pg_read_cursor,
+                'pool': pg_connection_pool,
+                'replicas': cls.__pg_replicas()
             }})
 
         except Exception as e:
@@ -219,8 +365,10 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
     @classmethod
     def pg_schema_generator(cls, engine_copy, schema_name):
         try:
-            if not engine_copy.dialect.has_schema(engine_copy, schema_name):
+            if not cls.schema_exists(engine_copy, schema_name):
                 engine_copy.execute(schema.CreateSchema(schema_name))
+                with cls.__metadata_lock:
+                    cls.__known_schemas.add((str(engine_copy.url), schema_name))
                 cls.connection_manager_logger.info(
                     '[connection_manager]: Successfully generated schema: {} in respective database of '
                     'postgresql'.format(schema_name))
@@ -235,14 +383,120 @@ class ConnectionManager(ConnectionDialects, metaclass=Singleton):
                     schema_name))
             cls.connection_manager_logger.error(str(e))
 
+    @classmethod
+    def schema_exists(cls, engine_copy, schema_name):
+        """
+        Check if schema exists. Schemas found are remembered for the life of the process; so, catalog is queried
+        only until a schema is found.
+        :param engine_copy: SQL Alchemy engine.
+        :param schema_name: Name of schema.
+        :return: Bool
+        """
+        schema_key = (str(engine_copy.url), schema_name)
+        if schema_key in cls.__known_schemas:
+            return True
+        if engine_copy.dialect.has_schema(engine_copy, schema_name):
+            with cls.__metadata_lock:
+                cls.__known_schemas.add(schema_key)
+            return True
+        return False
+
+    @classmethod
+    def reflected_metadata(cls, engine_copy, schema_name=None):
+        """
+        MetaData of all tables in a schema; reflected once and cached for the life of the process. Cache is
+        invalidated by invalidate_metadata; which PROTON calls after DDL it issues.
+        :param engine_copy: SQL Alchemy engine.
+        :param schema_name: Name of schema; None for default schema (eg. sqlite).
+        :return: MetaData bound to engine_copy.
+        """
+        metadata_key = (str(engine_copy.url), schema_name)
+        metadata = cls.__metadata_store.get(metadata_key)
+        if metadata is None:
+            with cls.__metadata_lock:
+                metadata = cls.__metadata_store.get(metadata_key)
+                if metadata is None:
+                    metadata = MetaData(engine_copy, schema=schema_name)
+                    metadata.reflect()
+                    cls.__metadata_store[metadata_key] = metadata
+                    cls.connection_manager_logger.info(
+                        '[connection_manager]: {} tables of schema {} reflected & cached.'.format(len(metadata.tables),
+                                                                                                 schema_name))
+        return metadata
+
+    @classmethod
+    def reflected_table(cls, engine_copy, table_name, schema_name=None):
+        """
+        Reflected Table from metadata cache. Tables not in cache (eg. created since schema was reflected) are
+        reflected on their own and added to cache.
+        :param engine_copy: SQL Alchemy engine.
+        :param table_name: Name of table.
+        :param schema_name: Name of schema; None for default schema (eg. sqlite).
+        :return: sqlalchemy Table; raises NoSuchTableError if table does not exist.
+        """
+        metadata = cls.reflected_metadata(engine_copy, schema_name)
+        table_key = '{}.{}'.format(schema_name, table_name) if schema_name else table_name
+        if table_key not in metadata.tables:
+            with cls.__metadata_lock:
+                try:
+                    metadata.reflect(only=[table_name])
+                except InvalidRequestError:
+                    raise NoSuchTableError(table_key)
+        return metadata.tables[table_key]
+
+    @classmethod
+    def has_table(cls, engine_copy, table_name, schema_name=None):
+        """
+        :return: Bool indicating if table exists; as per metadata cache.
+        """
+        try:
+            cls.reflected_table(engine_copy, table_name, schema_name)
+            return True
+        except NoSuchTableError:
+            return False
+
+    @classmethod
+    def invalidate_metadata(cls, engine_copy=None, schema_name=None):
+        """
+        Drop cached metadata; to be called after DDL (CREATE, ALTER, DROP etc.) is issued.
+        :param engine_copy: SQL Alchemy engine whose metadata is dropped. None drops metadata of all engines.
+        :param schema_name: Schema whose metadata is dropped. Ignored if engine_copy is None.
+        :return: void
+        """
+        with cls.__metadata_lock:
+            if engine_copy is None:
+                cls.__known_schemas.clear()
+                cls.__metadata_store.clear()
+            else:
+                cls.__known_schemas.discard((str(engine_copy.url), schema_name))
+                cls.__metadata_store.pop((str(engine_copy.url), schema_name), None)
+        cls.connection_manager_logger.info('[connection_manager]: Metadata cache is invalidated for schema {} of '
+                                           '{}.'.format(schema_name, 'all engines' if engine_copy is None else
+                                                        engine_copy.url))
+
+    @classmethod
+    def is_ddl(cls, sql):
+        """
+        :param sql: SQL statement.
+        :return: Bool indicating if sql is DDL that changes schema; i.e. CREATE, ALTER, DROP or RENAME.
+        """
+        return cls.__ddl.match(sql) is not None
+
     @staticmethod
-    def __pg_cursor_generator(connection_store):
+    def __pg_cursor_generator(connection_store, name=None, read_only=False, tables=None):
         """
         a simple wrapper on top of __connection_store to help users easily generate cursors without typing much!
+        :param name: Name of a server side cursor; None for a client side cursor.
+        :param read_only: Cursor for reads; served by a read replica if any is declared in databaseConfig.ini.
+        Writes must use cursors that are not read_only; i.e. of primary.
+        :param tables: Tables read by a read_only cursor; reads of tables written to recently stay on primary.
         :return:
         """
         if 'postgresql' in connection_store:
-            return connection_store['postgresql']['getCursor'](connection_store['postgresql']['pool'])
+            pg_store = connection_store['postgresql']
+            if read_only:
+                return pg_store['getReadCursor'](pg_store['replicas'], pg_store['pool'], name, tables)
+            return pg_store['getCursor'](pg_store['pool'], name)
         else:
             raise Exception('[ConnectionManager]: Connection Store does not contain an entry for postgresql.'
                             'Check/Debug __connection_store in ConnectionManager.')
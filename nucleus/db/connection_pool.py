@@ -0,0 +1,190 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import threading
+import time
+from collections import deque
+from nucleus.generics.proton_metrics import ProtonMetrics
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class PoolTimeoutError(Exception):
+    """
+    Raised when no connection could be checked out of an exhausted pool within the checkout timeout.
+    """
+    pass
+
+
+class ConnectionPool(object):
+    """
+    Thread safe pool of database connections. Pool holds up to max_size connections; under load it may open up to
+    max_overflow more, which are closed as soon as they are returned. Once the pool is exhausted, checkouts wait for a
+    connection to be returned for up to timeout seconds and then raise PoolTimeoutError.
+
+    Pool is guarded by locks of threading module; under gevent workers, threading is monkey patched and waits are
+    cooperative. Connections are never opened or closed while the lock is held; so, a greenlet doing I/O never blocks
+    others from the pool.
+
+    In use & idle connections, waiters and time waited for checkouts are exported in ProtonMetrics labelled by
+    name of the pool.
+    """
+
+    def __init__(self, connect, min_size, max_size, max_overflow, timeout, name):
+        """
+        :param connect: Callable returning a new connection. Connections must have close() & may have closed.
+        :param min_size: Connections opened upfront.
+        :param max_size: Connections retained by the pool.
+        :param max_overflow: Connections opened beyond max_size under load; closed once returned.
+        :param timeout: Seconds a checkout waits for a connection once the pool is exhausted.
+        :param name: Name of pool; labels metrics.
+        """
+        super(ConnectionPool, self).__init__()
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.name = name
+        self.__connect = connect
+        self.__condition = threading.Condition(threading.Lock())
+        self.__idle = deque()
+        self.__size = 0
+        self.__in_use = 0
+        self.__waiters = 0
+        self.__pid = os.getpid()
+        for _ in range(min_size):
+            with self.__condition:
+                self.__size += 1
+                self.__in_use += 1
+            self.putconn(self.__open())
+
+    def __open(self):
+        # Caller reserves a slot (size & in_use) under the same lock it checks capacity with; so, concurrent checkouts
+        # can't take the pool beyond max_size + max_overflow. Connection is opened outside the lock.
+        try:
+            return self.__connect()
+        except Exception:
+            with self.__condition:
+                self.__size -= 1
+                self.__in_use -= 1
+                self.__condition.notify()
+            raise
+
+    def __after_fork(self):
+        # Connections inherited from parent process must not be used by a forked worker; they are abandoned as is.
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__idle.clear()
+            self.__size = self.__in_use = self.__waiters = 0
+
+    def __report(self):
+        ProtonMetrics.db_pool_connections.labels(pool=self.name, state='in_use').set(self.__in_use)
+        ProtonMetrics.db_pool_connections.labels(pool=self.name, state='idle').set(len(self.__idle))
+        ProtonMetrics.db_pool_waiters.labels(pool=self.name).set(self.__waiters)
+
+    def getconn(self, timeout=None):
+        """
+        Check out a connection; an idle one if available, a new one if pool has room.
+        :param timeout: Seconds to wait for a connection should the pool be exhausted. Defaults to timeout of pool.
+        :return: connection; raises PoolTimeoutError if none is available in time.
+        """
+        checkout_start = time.time()
+        deadline = checkout_start + (self.timeout if timeout is None else timeout)
+        connection = None
+        with self.__condition:
+            self.__after_fork()
+            while True:
+                if self.__idle:
+                    connection = self.__idle.pop()
+                    self.__in_use += 1
+                    break
+                if self.__size < self.max_size + self.max_overflow:
+                    self.__size += 1
+                    self.__in_use += 1
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.__report()
+                    ProtonMetrics.db_pool_timeouts.labels(pool=self.name).inc()
+                    raise PoolTimeoutError('Pool {} is exhausted; no connection was returned within {} '
+                                           'seconds.'.format(self.name, self.timeout if timeout is None else timeout))
+                self.__waiters += 1
+                self.__report()
+                self.__condition.wait(remaining)
+                self.__waiters -= 1
+            self.__report()
+        ProtonMetrics.db_pool_checkout_wait.labels(pool=self.name).observe(time.time() - checkout_start)
+
+        if connection is not None and getattr(connection, 'closed', False):
+            # Connection was closed while idle (eg. by the server); replaced with a new one.
+            self.putconn(connection, close=True)
+            return self.getconn(max(deadline - time.time(), 0))
+        return connection if connection is not None else self.__open()
+
+    def putconn(self, connection, close=False):
+        """
+        Return a connection to the pool.
+        :param connection: A connection checked out of this pool.
+        :param close: Close the connection instead of retaining it; eg. if it is broken.
+        :return: void
+        """
+        with self.__condition:
+            if self.__pid != os.getpid():
+                return
+            self.__in_use -= 1
+            close = close or getattr(connection, 'closed', False) or self.__size > self.max_size
+            if close:
+                self.__size -= 1
+            else:
+                self.__idle.append(connection)
+            self.__condition.notify()
+            self.__report()
+        if close:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def closeall(self):
+        """
+        Close idle connections; eg. before a worker shuts down.
+        :return: void
+        """
+        with self.__condition:
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__size -= len(idle)
+            self.__report()
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        """
+        :return: A dictionary of in_use, idle, size & waiters of the pool.
+        """
+        with self.__condition:
+            return {'in_use': self.__in_use, 'idle': len(self.__idle), 'size': self.__size, 'waiters': self.__waiters}
@@ -0,0 +1,182 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from nucleus.generics.proton_metrics import ProtonMetrics
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class LocalCache(object):
+    """
+    In-process (L1) cache that sits in front of redis within each worker. LocalCache is bounded both by number of
+    entries and by total size of values held; least recently used entries are evicted first.
+
+    Entries may be tagged (see CacheKeyBuilder.tag). Invalidating a tag drops entries tagged with it and bumps its
+    generation; values computed before that (whose generations of tags, read beforehand, differ) are not set. Writes
+    invalidate tags in every LocalCache of the writing process; see invalidate_tags_in_process. L1 of other processes
+    is not reached and may serve a response for up to its lifespan.
+    """
+    __instances = weakref.WeakSet()
+    __instances_lock = threading.Lock()
+
+    def __init__(self, max_entries, max_bytes):
+        super(LocalCache, self).__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.__tagged_keys = {}
+        self.__generations = {}
+        with LocalCache.__instances_lock:
+            LocalCache.__instances.add(self)
+
+    @staticmethod
+    def __size_of(value):
+        return len(value) if isinstance(value, (bytes, str)) else len(str(value))
+
+    def __drop(self, key):
+        value, expires_at, size, tags = self.__entries.pop(key)
+        self.__bytes -= size
+        for tag in tags:
+            keys = self.__tagged_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tagged_keys[tag]
+
+    def get(self, key):
+        """
+        Get value from L1.
+        :param key: A valid key.
+        :return: Value if key is present and live; None otherwise.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__stats['misses'] += 1
+                return None
+            if entry[1] <= time.time():
+                self.__drop(key)
+                self.__stats['misses'] += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats['hits'] += 1
+            return entry[0]
+
+    def set(self, key, value, lifespan, size=None, tags=None, generations=None):
+        """
+        Set value to L1.
+        :param key: A valid key.
+        :param value: The value. Values larger than max_bytes are not held in L1.
+        :param lifespan: Time to live in seconds. Callers must not exceed lifespan of the same entry in redis.
+        :param size: Size of value in bytes; for values other than bytes or str. Derived from value if None.
+        :param tags: Tags of value; invalidating any of them drops the entry.
+        :param generations: Generations of tags as read (see generations) before value was computed. Value is not set
+        if any of them is invalidated since. None sets value regardless.
+        :return: Bool indicating if value is held in L1.
+        """
+        size = self.__size_of(value) if size is None else size
+        if lifespan is None or lifespan <= 0 or size > self.max_bytes:
+            return False
+        tags = tuple(tags or ())
+        with self.__lock:
+            if generations is not None and any(self.__generations.get(tag, 0) != generation
+                                               for tag, generation in generations.items()):
+                return False
+            if key in self.__entries:
+                self.__drop(key)
+            self.__entries[key] = (value, time.time() + lifespan, size, tags)
+            self.__bytes += size
+            for tag in tags:
+                self.__tagged_keys.setdefault(tag, set()).add(key)
+            while len(self.__entries) > self.max_entries or self.__bytes > self.max_bytes:
+                self.__drop(next(iter(self.__entries)))
+                self.__stats['evictions'] += 1
+                ProtonMetrics.cache_evictions.labels(tier='l1').inc()
+        return True
+
+    def delete(self, key):
+        """
+        Delete an entry from L1.
+        :param key: A valid key.
+        :return: Bool indicating if key was present.
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__drop(key)
+                return True
+            return False
+
+    def generations(self, tags):
+        """
+        :param tags: A list of tags.
+        :return: A dictionary of tag to its generation; bumped every time the tag is invalidated.
+        """
+        with self.__lock:
+            return {tag: self.__generations.get(tag, 0) for tag in tags}
+
+    def invalidate_tags(self, tags):
+        """
+        Drop entries tagged with any of the given tags.
+        :param tags: A list of tags.
+        :return: Number of entries dropped.
+        """
+        dropped_count = 0
+        with self.__lock:
+            for tag in tags:
+                self.__generations[tag] = self.__generations.get(tag, 0) + 1
+                for key in self.__tagged_keys.pop(tag, ()):
+                    if key in self.__entries:
+                        self.__drop(key)
+                        dropped_count += 1
+        return dropped_count
+
+    @classmethod
+    def invalidate_tags_in_process(cls, tags):
+        """
+        Invalidate tags in every LocalCache of this process; called by writers once a write is committed.
+        :param tags: A list of tags.
+        :return: Number of entries dropped.
+        """
+        with cls.__instances_lock:
+            local_caches = list(cls.__instances)
+        return sum(local_cache.invalidate_tags(tags) for local_cache in local_caches)
+
+    def stats(self):
+        """
+        :return: A dictionary of hits, misses, evictions, entries & bytes currently held by L1.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats.update({'entries': len(self.__entries), 'bytes': self.__bytes})
+            return stats
@@ -0,0 +1,96 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import re
+import threading
+from collections import OrderedDict
+from nucleus.generics.proton_metrics import ProtonMetrics
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class QueryTemplateCache(object):
+    """
+    LRU cache of SQL templates compiled for JinjaSql, keyed by SQL text. Compiling a template through Jinja is far
+    costlier than rendering it; so, each distinct SQL is compiled once.
+
+    Templates with no Jinja statements or comments and only plain placeholders (eg. {{ employeeId }}) take a fast
+    path: placeholders are replaced by bind parameters once and Jinja is not involved thereafter. Fast path is
+    available for named param style only; other templates are rendered by JinjaSql as usual.
+    """
+
+    __placeholder = re.compile(r'{{\s*([A-Za-z_][A-Za-z0-9_]*)\s*}}')
+
+    def __init__(self, j_sql, max_entries, template_generator=None):
+        """
+        :param j_sql: JinjaSql instance templates are compiled for.
+        :param max_entries: Maximum number of compiled templates held.
+        :param template_generator: Callable turning SQL into template source; applied once per SQL.
+        """
+        super(QueryTemplateCache, self).__init__()
+        self.max_entries = max_entries
+        self.__j_sql = j_sql
+        self.__template_generator = template_generator or (lambda sql: sql)
+        self.__templates = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __compile(self, sql):
+        source = self.__template_generator(sql)
+        if (getattr(self.__j_sql, 'param_style', None) == 'named' and '{%' not in source and '{#' not in source and
+                '{{' not in self.__placeholder.sub('', source)):
+            return 'fast', (self.__placeholder.sub(r':\1', source), self.__placeholder.findall(source))
+        return 'jinja', self.__j_sql.env.from_string(source)
+
+    def prepare(self, sql, binding_params):
+        """
+        Equivalent of JinjaSql.prepare_query for SQL text.
+        :param sql: SQL template; as accepted by generate_sql_template of models.
+        :param binding_params: A dictionary of values for placeholders in the template.
+        :return: A tuple of query & bind params.
+        """
+        with self.__lock:
+            compiled = self.__templates.get(sql)
+            if compiled is not None:
+                self.__templates.move_to_end(sql)
+        if compiled is None:
+            compiled = self.__compile(sql)
+            ProtonMetrics.query_template_misses.labels(kind=compiled[0]).inc()
+            with self.__lock:
+                self.__templates[sql] = compiled
+                while len(self.__templates) > self.max_entries:
+                    self.__templates.popitem(last=False)
+        else:
+            ProtonMetrics.query_template_hits.labels(kind=compiled[0]).inc()
+
+        kind, template = compiled
+        if kind == 'fast':
+            query, names = template
+            return query, {name: binding_params.get(name) for name in names}
+        return self.__j_sql.prepare_query(template, binding_params)
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__templates)
@@ -0,0 +1,162 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+import time
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class ReplicaRouter(object):
+    """
+    Routes reads across read replicas of a database. Replicas are load balanced either by least connections (reads in
+    flight relative to weight of replica) or by smooth weighted round robin. A replica whose connection fails is taken
+    out of rotation for retry_interval seconds and is then tried again.
+
+    Reads stay on primary for read_after_write_window seconds after a write to any of the tables they read; so, a
+    client reading right after its own write is not served stale rows by a lagging replica. ReplicaRouter knows only
+    writes recorded within its own (worker) process; writes of other workers are to be told by caller, which then
+    asks for primary rather than a replica. Models do so through write markers in redis; see
+    CacheKeyBuilder.write_markers.
+    """
+    STRATEGIES = ('least_connections', 'round_robin')
+
+    def __init__(self, replicas, strategy='least_connections', read_after_write_window=5, retry_interval=30):
+        """
+        :param replicas: A list of dictionaries; each with name, pool & optionally weight (defaults to 1).
+        :param strategy: One of STRATEGIES.
+        :param read_after_write_window: Seconds reads stay on primary after a write; 0 disables.
+        :param retry_interval: Seconds a failed replica is out of rotation.
+        """
+        super(ReplicaRouter, self).__init__()
+        if strategy not in self.STRATEGIES:
+            raise ValueError('[ReplicaRouter]: Strategy must be one of {}; {} is given.'.format(self.STRATEGIES,
+                                                                                               strategy))
+        self.strategy = strategy
+        self.read_after_write_window = read_after_write_window
+        self.retry_interval = retry_interval
+        self.__replicas = [{'name': replica['name'], 'pool': replica['pool'],
+                            'weight': max(1, int(replica.get('weight', 1))), 'in_flight': 0, 'current_weight': 0,
+                            'down_until': 0} for replica in replicas]
+        self.__lock = threading.Lock()
+        self.__last_write = 0
+        self.__unknown_write = 0
+        self.__table_writes = {}
+
+    def __len__(self):
+        return len(self.__replicas)
+
+    def record_write(self, tables=None):
+        """
+        Record a committed write; reads of these tables stay on primary for read_after_write_window seconds.
+        :param tables: Tables written to; None if not known, in which case all reads stay on primary.
+        :return: void
+        """
+        now = time.monotonic()
+        with self.__lock:
+            self.__last_write = now
+            if not tables:
+                self.__unknown_write = now
+            for table in tables or []:
+                self.__table_writes[table] = now
+
+    def recent_write(self, tables=None):
+        """
+        :param tables: Tables read; None or empty if not known, in which case a write to any table counts.
+        :return: Bool indicating if any of the tables is written to within read_after_write_window.
+        """
+        if self.read_after_write_window <= 0:
+            return False
+        cutoff = time.monotonic() - self.read_after_write_window
+        if tables:
+            return self.__unknown_write > cutoff or any(self.__table_writes.get(table, 0) > cutoff
+                                                        for table in tables)
+        return self.__last_write > cutoff
+
+    def acquire(self, tables=None):
+        """
+        Pick a replica for a read. Every replica acquired must be released.
+        :param tables: Tables read; see recent_write.
+        :return: Replica (a dictionary with name & pool); None if read must go to primary.
+        """
+        if not self.__replicas or self.recent_write(tables):
+            return None
+        now = time.monotonic()
+        with self.__lock:
+            healthy = [replica for replica in self.__replicas if replica['down_until'] <= now]
+            if not healthy:
+                return None
+            if self.strategy == 'round_robin':
+                total_weight = 0
+                for replica in healthy:
+                    replica['current_weight'] += replica['weight']
+                    total_weight += replica['weight']
+                chosen = max(healthy, key=lambda replica: replica['current_weight'])
+                chosen['current_weight'] -= total_weight
+            else:
+                chosen = min(healthy, key=lambda replica: (replica['in_flight'] / replica['weight'],
+                                                           -replica['weight']))
+            chosen['in_flight'] += 1
+            return chosen
+
+    def release(self, replica, failed=False):
+        """
+        Release a replica acquired for a read.
+        :param replica: Replica returned by acquire.
+        :param failed: True if connection to replica failed; replica is taken out of rotation.
+        :return: void
+        """
+        with self.__lock:
+            replica['in_flight'] -= 1
+        if failed:
+            self.mark_down(replica)
+
+    def mark_down(self, replica):
+        """
+        Take replica out of rotation for retry_interval seconds.
+        :param replica: Replica returned by acquire.
+        :return: void
+        """
+        with self.__lock:
+            replica['down_until'] = time.monotonic() + self.retry_interval
+            replica['current_weight'] = 0
+
+    def replica(self, name):
+        """
+        :param name: Name of replica.
+        :return: Replica by name; None if not found.
+        """
+        return next((replica for replica in self.__replicas if replica['name'] == name), None)
+
+    def stats(self):
+        """
+        :return: A list of dictionaries of name, weight, in_flight & healthy; one per replica.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            return [{'name': replica['name'], 'weight': replica['weight'], 'in_flight': replica['in_flight'],
+                     'healthy': replica['down_until'] <= now} for replica in self.__replicas]
@@ -0,0 +1,123 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import datetime
+import decimal
+import json
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+    # ujson accepts default hook from 5.x onwards; older versions can't encode Decimal & co. consistently.
+    ujson.dumps(decimal.Decimal(1), default=str)
+except Exception:
+    ujson = None
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class RowEncoder(object):
+    """
+    Encodes DB-API rows as JSON records; i.e. [{"column": value, ...}, ...]. Column names are taken from
+    cursor.description once per query. Output is alike for every dialect.
+
+    datetime, date & time are encoded in ISO 8601 and UUID as string. Decimal is encoded as string of its exact
+    digits; NUMERIC values (eg. money) would otherwise lose precision as float. orjson or ujson is used if installed;
+    json otherwise.
+    """
+
+    if orjson is not None:
+        backend = 'orjson'
+    elif ujson is not None:
+        backend = 'ujson'
+    else:
+        backend = 'json'
+
+    def __init__(self, columns):
+        """
+        :param columns: Column names; in order of values in rows.
+        """
+        super(RowEncoder, self).__init__()
+        self.columns = tuple(columns)
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """
+        :param cursor: DB-API cursor on which query is executed.
+        :return: RowEncoder for rows of the cursor.
+        """
+        return cls(column[0] for column in cursor.description)
+
+    @staticmethod
+    def __default(value):
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value).hex()
+        return str(value)
+
+    @classmethod
+    def dumps(cls, value):
+        """
+        :param value: Any value composed of JSON types and types RowEncoder supports.
+        :return: Compact JSON; str.
+        """
+        if orjson is not None:
+            return orjson.dumps(value, default=cls.__default).decode('utf-8')
+        if ujson is not None:
+            return ujson.dumps(value, default=cls.__default, ensure_ascii=False)
+        return json.dumps(value, default=cls.__default, separators=(',', ':'), ensure_ascii=False)
+
+    def records(self, rows):
+        """
+        :param rows: A list of rows.
+        :return: A list of dictionaries of column name to value.
+        """
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in rows]
+
+    def encode(self, rows):
+        """
+        :param rows: A list of rows.
+        :return: Rows as a JSON array of records; str.
+        """
+        return self.dumps(self.records(rows))
+
+    def encode_rows(self, rows):
+        """
+        :param rows: A list of rows.
+        :return: Rows as comma separated JSON records, without enclosing brackets; bytes. For streaming.
+        """
+        return self.encode(rows)[1:-1].encode('utf-8')
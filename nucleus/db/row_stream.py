@@ -0,0 +1,79 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from nucleus.db.row_encoder import RowEncoder
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class RowStream(object):
+    """
+    Rows of an executed cursor streamed as a JSON array of records as encoded by RowEncoder. Rows are fetched
+    chunk_size at a time and each chunk is encoded as it is fetched; so, memory held is bound by chunk_size regardless
+    of number of rows. Assign to resp.stream.
+
+    RowStream must be closed once done with; it is closed on its own once exhausted and WSGI servers close it should
+    the client go away mid-way. Closing releases cursor & connection via on_close.
+    """
+
+    def __init__(self, cursor, chunk_size, on_close=None):
+        """
+        :param cursor: DB-API cursor on which query is executed.
+        :param chunk_size: Rows fetched (fetchmany) & encoded at a time.
+        :param on_close: Callable releasing cursor & connection.
+        """
+        super(RowStream, self).__init__()
+        self.chunk_size = chunk_size
+        self.__cursor = cursor
+        self.__on_close = on_close
+        self.__closed = False
+
+    def __iter__(self):
+        try:
+            encoder = None
+            separator = b'['
+            while True:
+                rows = self.__cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                if encoder is None:
+                    # Server side cursors describe columns only once rows are fetched.
+                    encoder = RowEncoder.from_cursor(self.__cursor)
+                yield separator + encoder.encode_rows(rows)
+                separator = b','
+            yield b']' if separator == b',' else b'[]'
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Release cursor & connection. Safe to call more than once.
+        :return: void
+        """
+        if not self.__closed:
+            self.__closed = True
+            if self.__on_close is not None:
+                self.__on_close()
@@ -0,0 +1,75 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from collections import OrderedDict
+from nucleus.generics.consistent_hash import ConsistentHash
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class ShardedRedis(object):
+    """
+    Redis clients of all nodes that make up PROTON's cache. Keys are spread across nodes by consistent hashing; so,
+    every key is always routed to the same node and adding/removing a node remaps only a fraction of keys.
+    """
+
+    def __init__(self, clients, virtual_nodes=160):
+        """
+        :param clients: A dictionary of node name to redis client.
+        :param virtual_nodes: Points per node on the hash ring.
+        """
+        super(ShardedRedis, self).__init__()
+        self.__clients = OrderedDict(clients)
+        self.__ring = ConsistentHash(list(self.__clients), virtual_nodes)
+
+    @property
+    def nodes(self):
+        return list(self.__clients)
+
+    def node(self, key):
+        """
+        :param key: A valid key.
+        :return: Name of node the key belongs to.
+        """
+        return self.__ring.get_node(key)
+
+    def client(self, node):
+        """
+        :param node: Name of node.
+        :return: redis client of the node.
+        """
+        return self.__clients[node]
+
+    def group(self, keys):
+        """
+        Group keys by node they belong to.
+        :param keys: A list of valid keys.
+        :return: An ordered dictionary of node name to list of (position in keys, key) tuples.
+        """
+        groups = OrderedDict()
+        for index, key in enumerate(keys):
+            groups.setdefault(self.node(key), []).append((index, key))
+        return groups
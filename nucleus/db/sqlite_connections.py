@@ -0,0 +1,102 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class SQLiteConnections(object):
+    """
+    SQLite connections to a database; one per thread. sqlite3 connections must not be shared across threads; here,
+    every thread (greenlet under gevent, as threading.local is monkey patched) gets a connection of its own that
+    lives as long as the thread does. Connections are reopened in a forked worker.
+
+    Read-only connections are opened with mode=ro & query_only; any number of them read concurrently with a writer in
+    WAL mode. Should the database not exist yet, read-only connections are opened as read-write connections would be
+    (creating the database) with query_only.
+    """
+
+    def __init__(self, database, read_only=False, journal_mode='WAL', synchronous='NORMAL', cache_size=-2000,
+                 mmap_size=0, busy_timeout=5000):
+        """
+        :param database: Path of SQLite database.
+        :param read_only: Open read-only connections.
+        :param journal_mode: PRAGMA journal_mode; set by read-write connections only, as it persists in database.
+        :param synchronous: PRAGMA synchronous.
+        :param cache_size: PRAGMA cache_size; pages, or KiB if negative.
+        :param mmap_size: PRAGMA mmap_size in bytes.
+        :param busy_timeout: Milliseconds to wait on a locked database.
+        """
+        super(SQLiteConnections, self).__init__()
+        self.database = database
+        self.read_only = read_only
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.__local = threading.local()
+
+    def __open(self):
+        if self.read_only and os.path.isfile(self.database):
+            # Path is percent encoded by as_uri; so, ?, # or % within it can't be taken for URI syntax.
+            connection = sqlite3.connect('{}?mode=ro'.format(Path(self.database).resolve().as_uri()), uri=True,
+                                         timeout=self.busy_timeout / 1000.0)
+            connection.execute('PRAGMA query_only = ON')
+        elif self.read_only:
+            connection = sqlite3.connect(self.database, timeout=self.busy_timeout / 1000.0)
+            connection.execute('PRAGMA query_only = ON')
+        else:
+            connection = sqlite3.connect(self.database, timeout=self.busy_timeout / 1000.0)
+            connection.execute('PRAGMA journal_mode = {}'.format(self.journal_mode))
+        connection.execute('PRAGMA synchronous = {}'.format(self.synchronous))
+        connection.execute('PRAGMA cache_size = {}'.format(int(self.cache_size)))
+        connection.execute('PRAGMA mmap_size = {}'.format(int(self.mmap_size)))
+        connection.execute('PRAGMA busy_timeout = {}'.format(int(self.busy_timeout)))
+        return connection
+
+    def connection(self):
+        """
+        :return: sqlite3 connection of current thread; opened on first use.
+        """
+        if getattr(self.__local, 'pid', None) != os.getpid():
+            self.__local.connection = self.__open()
+            self.__local.pid = os.getpid()
+        return self.__local.connection
+
+    def close(self):
+        """
+        Close connection of current thread, if any. Next call to connection opens a new one.
+        :return: void
+        """
+        connection = getattr(self.__local, 'connection', None)
+        self.__local.connection = self.__local.pid = None
+        if connection is not None:
+            connection.close()
@@ -0,0 +1,131 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+import time
+from nucleus.generics.proton_metrics import ProtonMetrics
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised in place of calling a dependency whose circuit is open.
+    """
+    pass
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker for a dependency (eg. redis) that may become unavailable.
+
+    closed   : Calls go through. After failure_threshold consecutive failures, circuit opens.
+    open     : Calls are refused right away. Once reset_timeout elapses, circuit turns half-open.
+    half-open: A single call (probe) goes through; others are refused. Success of probe closes the circuit; its
+               failure opens the circuit again for twice as long as before; up to max_reset_timeout.
+
+    State is exported as proton_circuit_breaker_state; 0 - closed, 1 - half-open, 2 - open.
+    """
+
+    CLOSED = 'closed'
+    HALF_OPEN = 'half-open'
+    OPEN = 'open'
+    __state_values = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name, failure_threshold, reset_timeout, max_reset_timeout):
+        """
+        :param name: Name of the dependency; labels the state metric.
+        :param failure_threshold: Consecutive failures after which circuit opens.
+        :param reset_timeout: Seconds circuit stays open before the first probe.
+        :param max_reset_timeout: Upper bound of seconds circuit stays open as it backs off exponentially.
+        """
+        super(CircuitBreaker, self).__init__()
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.__lock = threading.Lock()
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__current_reset_timeout = reset_timeout
+        self.__opened_at = 0
+        self.__set_state(self.CLOSED)
+
+    def __set_state(self, state):
+        self.__state = state
+        ProtonMetrics.circuit_breaker_state.labels(name=self.name).set(self.__state_values[state])
+
+    @property
+    def state(self):
+        return self.__state
+
+    def available(self):
+        """
+        :return: Bool indicating if a call would be let through at this moment; without claiming the probe.
+        """
+        with self.__lock:
+            if self.__state == self.OPEN:
+                return time.time() - self.__opened_at >= self.__current_reset_timeout
+            return self.__state == self.CLOSED
+
+    def allow_request(self):
+        """
+        Ask for permission to call the dependency. While half-open, only the caller that claimed the probe is let
+        through.
+        :return: Bool
+        """
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return True
+            if self.__state == self.OPEN and time.time() - self.__opened_at >= self.__current_reset_timeout:
+                self.__set_state(self.HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Dependency responded; circuit closes and backoff is reset.
+        :return: void
+        """
+        with self.__lock:
+            self.__failures = 0
+            self.__current_reset_timeout = self.reset_timeout
+            if self.__state != self.CLOSED:
+                self.__set_state(self.CLOSED)
+
+    def record_failure(self):
+        """
+        Dependency is unavailable. Failure of a probe opens circuit again with twice the previous timeout.
+        :return: void
+        """
+        with self.__lock:
+            self.__failures += 1
+            if self.__state == self.HALF_OPEN:
+                self.__current_reset_timeout = min(self.__current_reset_timeout * 2, self.max_reset_timeout)
+            elif self.__state == self.OPEN or self.__failures < self.failure_threshold:
+                return
+            self.__opened_at = time.time()
+            self.__set_state(self.OPEN)
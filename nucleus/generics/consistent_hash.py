@@ -0,0 +1,88 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import bisect
+import hashlib
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class ConsistentHash(object):
+    """
+    Consistent hash ring. Each node is placed on the ring at several points (virtual nodes); a key belongs to the node
+    at the first point clockwise from the key's hash. Adding or removing a node remaps only keys of that node.
+    """
+
+    def __init__(self, nodes=None, virtual_nodes=160):
+        """
+        :param nodes: Names of nodes on the ring.
+        :param virtual_nodes: Points per node on the ring. More points spread keys more evenly.
+        """
+        super(ConsistentHash, self).__init__()
+        self.virtual_nodes = virtual_nodes
+        self.__points = []
+        self.__point_nodes = {}
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def __hash(value):
+        return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+    @property
+    def nodes(self):
+        return sorted(set(self.__point_nodes.values()))
+
+    def add_node(self, node):
+        """
+        :param node: Name of node.
+        :return: void
+        """
+        for replica in range(self.virtual_nodes):
+            point = self.__hash('{}#{}'.format(node, replica))
+            if point not in self.__point_nodes:
+                bisect.insort(self.__points, point)
+                self.__point_nodes[point] = node
+
+    def remove_node(self, node):
+        """
+        :param node: Name of node.
+        :return: void
+        """
+        self.__points = [point for point in self.__points if self.__point_nodes[point] != node]
+        self.__point_nodes = {point: self.__point_nodes[point] for point in self.__points}
+
+    def get_node(self, key):
+        """
+        :param key: A valid key; str or bytes.
+        :return: Name of node the key belongs to; None if ring is empty.
+        """
+        if not self.__points:
+            return None
+        if isinstance(key, bytes):
+            key = key.decode('utf-8')
+        index = bisect.bisect(self.__points, self.__hash(key)) % len(self.__points)
+        return self.__point_nodes[self.__points[index]]
@@ -0,0 +1,115 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import time
+from contextlib import contextmanager
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class ProtonMetrics(object):
+    """
+    Metrics recorded by PROTON's internals (cache, redis etc.) as opposed to per request metrics of
+    ProtonPrometheus. Metrics are held at class level in a registry of their own; so, they are shared by all
+    consumers within a worker and are exposed by ProtonPrometheus on /metrics alongside request metrics.
+
+    Route labels are route templates as registered with falcon (eg. /get_employee_details); never raw request paths.
+    """
+
+    registry = CollectorRegistry()
+
+    cache_hits = Counter('proton_cache_hits_total', 'Responses served from cache', ['route', 'tier'],
+                         registry=registry)
+    cache_misses = Counter('proton_cache_misses_total', 'Requests that found no live response in cache', ['route'],
+                           registry=registry)
+    cache_stale = Counter('proton_cache_stale_total', 'Stale responses served from cache', ['route'],
+                          registry=registry)
+    cache_evictions = Counter('proton_cache_evictions_total', 'Entries evicted from cache to make room for others',
+                              ['tier'], registry=registry)
+    cache_writes_dropped = Counter('proton_cache_writes_dropped_total',
+                                   'Cache writes dropped as queue of background cache writer was full',
+                                   registry=registry)
+    cache_payload_size = Histogram('proton_cache_payload_size_bytes', 'Size of responses set to cache', ['route'],
+                                   buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+                                   registry=registry)
+
+    request_phase_latency = Histogram('proton_request_phase_seconds',
+                                      'Time spent by requests in each phase; auth, cache, controller, db & '
+                                      'serialization', ['route', 'phase'],
+                                      buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+                                      registry=registry)
+
+    db_pool_connections = Gauge('proton_db_pool_connections', 'Connections held by a database pool',
+                                ['pool', 'state'], registry=registry)
+    db_pool_waiters = Gauge('proton_db_pool_waiters', 'Requests waiting for a connection from a database pool',
+                            ['pool'], registry=registry)
+    db_pool_checkout_wait = Histogram('proton_db_pool_checkout_wait_seconds',
+                                      'Time waited for a connection from a database pool', ['pool'],
+                                      buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10,
+                                               30),
+                                      registry=registry)
+    db_pool_timeouts = Counter('proton_db_pool_timeouts_total',
+                               'Checkouts that timed out as database pool was exhausted', ['pool'],
+                               registry=registry)
+
+    query_template_hits = Counter('proton_query_template_hits_total',
+                                  'SQL templates found compiled in query template cache', ['kind'],
+                                  registry=registry)
+    query_template_misses = Counter('proton_query_template_misses_total',
+                                    'SQL templates compiled as they were not in query template cache', ['kind'],
+                                    registry=registry)
+
+    circuit_breaker_state = Gauge('proton_circuit_breaker_state',
+                                  'State of circuit breaker of a dependency; 0 - closed, 1 - half-open, 2 - open',
+                                  ['name'], registry=registry)
+    redis_errors = Counter('proton_redis_errors_total', 'Redis commands that raised an error', ['command'],
+                           registry=registry)
+    redis_latency = Histogram('proton_redis_command_latency_seconds', 'Latency of redis commands', ['command'],
+                              buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1),
+                              registry=registry)
+
+    @classmethod
+    @contextmanager
+    def redis_command(cls, command):
+        """
+        Time a redis command (or a pipeline of them) and count it as an error should it raise. Exceptions are
+        re-raised as is.
+
+            with ProtonMetrics.redis_command('get'):
+                redis_instance.get(key)
+
+        :param command: Name of redis command.
+        :return: context manager
+        """
+        start = time.time()
+        try:
+            yield
+        except Exception:
+            cls.redis_errors.labels(command=command).inc()
+            raise
+        finally:
+            cls.redis_latency.labels(command=command).observe(time.time() - start)
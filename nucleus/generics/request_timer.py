@@ -0,0 +1,128 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class RequestTimer(object):
+    """
+    Time spent by a request in each phase of PROTON stack; i.e. auth, cache, controller, db & serialization. A timer is
+    created per request and is held on req.context; so, concurrent requests never share one.
+
+    Phases may be nested (eg. db within controller); time of a phase excludes time of phases nested within it. So,
+    phases add up to at most the time taken by the request.
+
+    Layers that have no access to the request (eg. models) record into timer of the request being serviced by the
+    current thread (greenlet under gevent) through RequestTimer.measure.
+    """
+
+    PHASES = ('auth', 'cache', 'controller', 'db', 'serialization')
+    __current = threading.local()
+
+    def __init__(self):
+        super(RequestTimer, self).__init__()
+        self.start = time.time()
+        self.phases = OrderedDict()
+        self.__nested = []
+
+    @classmethod
+    def current(cls):
+        """
+        :return: Timer of the request being serviced by current thread; None if there is none.
+        """
+        return getattr(cls.__current, 'timer', None)
+
+    def activate(self):
+        """
+        Make this timer the current timer of this thread.
+        :return: void
+        """
+        RequestTimer.__current.timer = self
+
+    def deactivate(self):
+        """
+        Unset current timer of this thread; if it is this timer.
+        :return: void
+        """
+        if RequestTimer.current() is self:
+            RequestTimer.__current.timer = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the block as the given phase. Time of repeated phases adds up.
+
+            with req.context.timer.phase('cache'):
+                cache_response = lookup(cache_key)
+
+        :param name: Name of phase.
+        :return: context manager
+        """
+        phase_start = time.time()
+        self.__nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.time() - phase_start
+            nested = self.__nested.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+            if self.__nested:
+                self.__nested[-1] += elapsed
+
+    @classmethod
+    @contextmanager
+    def measure(cls, name):
+        """
+        Time the block as the given phase of the current request; no-op if current thread is not servicing a request.
+        :param name: Name of phase.
+        :return: context manager
+        """
+        timer = cls.current()
+        if timer is None:
+            yield
+        else:
+            with timer.phase(name):
+                yield
+
+    def elapsed(self):
+        """
+        :return: Time in seconds since the request has arrived.
+        """
+        return time.time() - self.start
+
+    def server_timing(self):
+        """
+        Phases formatted for Server-Timing header; durations are in milliseconds as per the spec.
+        :return: Server-Timing header value. eg. auth;dur=0.41, cache;dur=1.02, total;dur=12.87
+        """
+        metrics = ['{};dur={:.2f}'.format(name, duration * 1000) for name, duration in self.phases.items()]
+        metrics.append('total;dur={:.2f}'.format(self.elapsed() * 1000))
+        return ', '.join(metrics)
@@ -0,0 +1,92 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+
+__author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class _Flight(object):
+    """
+    A computation in progress for a given key.
+    """
+
+    def __init__(self):
+        super(_Flight, self).__init__()
+        self.done = threading.Event()
+        self.value = None
+
+
+class SingleFlight(object):
+    """
+    Per key request coalescing. For a given key, only the first caller (leader) computes the value; all other
+    concurrent callers (followers) wait for leader's result instead of repeating the same computation.
+    """
+
+    def __init__(self):
+        super(SingleFlight, self).__init__()
+        self.__flights = {}
+        self.__lock = threading.Lock()
+
+    def acquire(self, key):
+        """
+        Join the flight for given key; starting one if none is in progress.
+        :param key: A valid key.
+        :return: A tuple of (is_leader, flight). Leader must call release for the key once done.
+        """
+        with self.__lock:
+            flight = self.__flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self.__flights[key] = flight
+                return True, flight
+            return False, flight
+
+    @staticmethod
+    def wait(flight, timeout):
+        """
+        Wait for leader of the flight to release its result.
+        :param flight: flight as returned by acquire.
+        :param timeout: Maximum time in seconds to wait for.
+        :return: Value released by leader; None on timeout or if leader did not produce a value.
+        """
+        if flight.done.wait(timeout):
+            return flight.value
+        return None
+
+    def release(self, key, value=None):
+        """
+        Complete the flight for given key and wake all its followers.
+        :param key: A valid key.
+        :param value: Value to be handed over to followers. None lets followers compute on their own.
+        :return: void
+        """
+        with self.__lock:
+            flight = self.__flights.pop(key, None)
+        if flight is not None:
+            flight.value = value
+            flight.done.set()
@@ -25,11 +25,10 @@ import falcon
 import json
 from datetime import datetime
 from nucleus.db.connection_manager import ConnectionManager
+from nucleus.generics.request_timer import RequestTimer
 from nucleus.iam.jwt_manager import JWTManager
 from nucleus.iam.password_manager import PasswordManager
-from sqlalchemy import MetaData
 from sqlalchemy import select
-from sqlalchemy import Table
 
 __author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
 __copyright__ = "Copyright (C) 2018 Pruthvi Kumar | http://www.apricity.co.in"
@@ -93,8 +92,7 @@ class ProtonLogin(ConnectionManager, PasswordManager, JWTManager):
 
                 with connection.begin() as transaction:
                     if db_flavour == 'sqlite':
-                        metadata = MetaData(self.__alchemy_engine[db_flavour], reflect=True)
-                        table = metadata.tables[table_name]
+                        table = self.reflected_table(self.__alchemy_engine[db_flavour], table_name)
 
                         # Check if user exists:
                         query_existence = select([table.c.id]).where(table.c.user_name == login_payload['user_name'])
@@ -136,14 +134,12 @@ class ProtonLogin(ConnectionManager, PasswordManager, JWTManager):
                                     'token': token
                                 }
                     elif db_flavour == 'postgresql':
-                        schema_status = self.__alchemy_engine[db_flavour].dialect.has_schema(
-                            self.__alchemy_engine[db_flavour], schema_name)
-                        metadata = MetaData(self.__alchemy_engine[db_flavour], reflect=True, schema=schema_name)
-                        metadata.reflect(self.__alchemy_engine[db_flavour])
+                        schema_status = self.schema_exists(self.__alchemy_engine[db_flavour], schema_name)
 
                         if schema_status:
                             # Check if user exists:
-                            login_registry_table = Table('PROTON_login_registry', metadata)
+                            login_registry_table = self.reflected_table(self.__alchemy_engine[db_flavour],
+                                                                        'PROTON_login_registry', schema_name)
                             query_existence = select([login_registry_table.c.id]).where(
                                 login_registry_table.c.user_name == login_payload['user_name'])
                             existence_results = (connection.execute(query_existence)).fetchall()
@@ -226,7 +222,8 @@ class IctrlProtonLogin(ProtonLogin):
     def on_post(self, req, resp):
         try:
             post_payload = json.loads(req.stream.read())
-            results = self.login(post_payload['db_flavour'], post_payload['login_payload'])
+            with RequestTimer.measure('controller'):
+                results = self.login(post_payload['db_flavour'], post_payload['login_payload'])
 
             resp.body = json.dumps(results)
             resp.status = falcon.HTTP_200
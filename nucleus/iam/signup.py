@@ -28,6 +28,7 @@ from colorama import Fore
 from colorama import Style
 from datetime import datetime
 from nucleus.db.connection_manager import ConnectionManager
+from nucleus.generics.request_timer import RequestTimer
 from nucleus.iam.password_manager import PasswordManager
 from sqlalchemy import Column
 from sqlalchemy import DateTime, Integer, String
@@ -111,8 +112,7 @@ class ProtonSignup(ConnectionManager, PasswordManager):
                 with connection.begin() as transaction:
                     if db_flavour == 'sqlite':
 
-                        metadata = MetaData(self.__alchemy_engine[db_flavour], reflect=True)
-                        table = metadata.tables[table_name]
+                        table = self.reflected_table(self.__alchemy_engine[db_flavour], table_name)
 
                         # Check if user already exists:
                         query_pre_existance = select([table.c.id]).where(table.c.email == signup_payload['email'])
@@ -120,7 +120,8 @@ class ProtonSignup(ConnectionManager, PasswordManager):
 
                         if len(pre_existance_details) == 0:
                             # check is user with similar user_name already exist.
-                            login_table = metadata.tables['PROTON_login_registry']
+                            login_table = self.reflected_table(self.__alchemy_engine[db_flavour],
+                                                               'PROTON_login_registry')
                             query_login_registry = select([login_table.c.id]).where(login_table.c.user_name ==
                                                                                     login_payload['user_name'])
                             login_registry_id = (connection.execute(query_login_registry)).fetchall()
@@ -175,63 +176,24 @@ class ProtonSignup(ConnectionManager, PasswordManager):
 
                         if schema_status:
 
-                            metadata = MetaData(self.__alchemy_engine[db_flavour], reflect=True, schema=schema_name)
-                            metadata.reflect(self.__alchemy_engine[db_flavour])
                             df_signup_payload = pd.DataFrame(signup_payload, index=[0])
 
-                            user_registry_existence_flag = False
-                            login_registry_existence_flag = False
-
-                            for table in metadata.tables.values():
-                                if table.name == 'PROTON_user_registry':
-                                    user_registry_existence_flag = True
-                                elif table.name == 'PROTON_login_registry':
-                                    login_registry_existence_flag = True
-                                else:
-                                    pass
-
-                            if user_registry_existence_flag:
-                                user_registry_table = Table('PROTON_user_registry', metadata)
-                                query_user_registry_id = select([user_registry_table.c.id]).where(
-                                    user_registry_table.c.email == signup_payload['email'])
-                                user_registry_id = (connection.execute(query_user_registry_id)).fetchall()
-
-                                if len(user_registry_id) == 0:
-                                    df_signup_payload.to_sql(table_name, self.__alchemy_engine[db_flavour],
-                                                             index=False, if_exists='append', schema=schema_name)
-                                    user_registry_id = (connection.execute(query_user_registry_id)).fetchall()[0][0]
-                                    login_payload.update({'user_registry_id': user_registry_id})
-                                else:
-                                    self.iam_signup_logger.info(
-                                        '[ProtonSignup]: New signup with Postgresql from {} for {} user_name not '
-                                        'allowed due to pre-existing email.'.format(signup_payload['email'],
-                                                                                    login_payload['user_name']))
-                                    return {
-                                        'status': False,
-                                        'message': 'User with email {} already exist. Please try '
-                                                   'login.'.format(signup_payload['email'])
-                                    }
+                            user_registry_existence_flag = self.has_table(self.__alchemy_engine[db_flavour],
+                                                                          'PROTON_user_registry', schema_name)
+                            login_registry_existence_flag = self.has_table(self.__alchemy_engine[db_flavour],
+                                                                           'PROTON_login_registry', schema_name)
 
-                            else:
-                                Table('PROTON_user_registry', metadata,
+                            if not (user_registry_existence_flag and login_registry_existence_flag):
+                                # Registries are declared on a MetaData of their own; cached metadata is shared by
+                                # concurrent requests and is never added to. create_all skips registries that exist.
+                                registry_metadata = MetaData(self.__alchemy_engine[db_flavour], schema=schema_name)
+                                Table('PROTON_user_registry', registry_metadata,
                                       Column('id', Integer, primary_key=True, nullable=False, autoincrement=True),
                                       Column('first_name', String, nullable=False),
                                       Column('last_name', String, nullable=False),
                                       Column('email', String, nullable=False),
                                       Column('creation_date_time', DateTime, nullable=False))
-                                metadata.create_all()
-
-                                df_signup_payload.to_sql(table_name, self.__alchemy_engine[db_flavour], index=False,
-                                                         if_exists='append', schema=schema_name)
-
-                                user_registry_table = Table('PROTON_user_registry', metadata)
-                                query_user_registry_id = select([user_registry_table.c.id]).where(
-                                    user_registry_table.c.email == signup_payload['email'])
-                                user_registry_id = (connection.execute(query_user_registry_id)).fetchall()[0][0]
-                                login_payload.update({'user_registry_id': user_registry_id})
-
-                            if not login_registry_existence_flag:
-                                Table('PROTON_login_registry', metadata,
+                                Table('PROTON_login_registry', registry_metadata,
                                       Column('id', Integer, primary_key=True, nullable=False, autoincrement=True),
                                       Column('user_registry_id', Integer,
                                              ForeignKey('PROTON_user_registry.id', onupdate="CASCADE",
@@ -239,9 +201,34 @@ class ProtonSignup(ConnectionManager, PasswordManager):
                                       Column('user_name', String, nullable=False),
                                       Column('password', String, nullable=False),
                                       Column('last_login_date_time', DateTime, nullable=True))
-                                metadata.create_all()
+                                registry_metadata.create_all()
+                                # DDL: cached metadata is dropped once registries are created.
+                                self.invalidate_metadata(self.__alchemy_engine[db_flavour], schema_name)
+
+                            user_registry_table = self.reflected_table(self.__alchemy_engine[db_flavour],
+                                                                       'PROTON_user_registry', schema_name)
+                            query_user_registry_id = select([user_registry_table.c.id]).where(
+                                user_registry_table.c.email == signup_payload['email'])
+                            user_registry_id = (connection.execute(query_user_registry_id)).fetchall()
+
+                            if len(user_registry_id) == 0:
+                                df_signup_payload.to_sql(table_name, self.__alchemy_engine[db_flavour],
+                                                         index=False, if_exists='append', schema=schema_name)
+                                user_registry_id = (connection.execute(query_user_registry_id)).fetchall()[0][0]
+                                login_payload.update({'user_registry_id': user_registry_id})
+                            else:
+                                self.iam_signup_logger.info(
+                                    '[ProtonSignup]: New signup with Postgresql from {} for {} user_name not '
+                                    'allowed due to pre-existing email.'.format(signup_payload['email'],
+                                                                                login_payload['user_name']))
+                                return {
+                                    'status': False,
+                                    'message': 'User with email {} already exist. Please try '
+                                               'login.'.format(signup_payload['email'])
+                                }
 
-                            login_registry_table = Table('PROTON_login_registry', metadata)
+                            login_registry_table = self.reflected_table(self.__alchemy_engine[db_flavour],
+                                                                        'PROTON_login_registry', schema_name)
                             query_login_registry = select([login_registry_table.c.id]).where(
                                 login_registry_table.c.user_name == login_payload['user_name'])
                             login_registry_id = (connection.execute(query_login_registry)).fetchall()
@@ -253,7 +240,6 @@ class ProtonSignup(ConnectionManager, PasswordManager):
                             else:
                                 # Another user with similar user_name exists. Invalidate signup and ask user to use
                                 # another user name
-                                user_registry_table = Table('PROTON_user_registry', metadata)
                                 delete_instance = user_registry_table.delete().where(user_registry_table.c.email ==
                                                                                      signup_payload['email'])
                                 delete_instance.execute()
@@ -327,7 +313,8 @@ class IctrlProtonSignup(ProtonSignup):
     def on_post(self, req, resp):
         try:
             post_payload = json.loads(req.stream.read())
-            results = self.signup(post_payload['db_flavour'], post_payload['signup_payload'])
+            with RequestTimer.measure('controller'):
+                results = self.signup(post_payload['db_flavour'], post_payload['signup_payload'])
 
             resp.body = json.dumps(results)
             resp.status = falcon.HTTP_201
@@ -73,6 +73,8 @@ class Ctrl_{{ controllerName }}(Model_{{ modelName }}, Parallel_Programming, Con
         # Method Definition Index
         ###########################
         # Get   : self.getter["get_model_data"](db_flavour, example_sql, binding_params)
+        # Stream: self.getter["stream_model_data"](db_flavour, example_sql, binding_params) # For large reads; rows
+        # are fetched & encoded in chunks as response is sent. Return it as is from here.
         # Insert: self.transaction['insert'](db_flavour, db_name, table_name, input_payload)
         # Update: self.transaction['update'](db_flavour, sql, binding_params)
         # Delete: self.transaction['update'](db_flavour, sql, binding_params)
@@ -86,6 +88,21 @@ class Ctrl_{{ controllerName }}(Model_{{ modelName }}, Parallel_Programming, Con
         # Non HTTP Operations: self.concurrency_wrapper('non-http', target_function, arguments)
         # To learn more, do dir(self.concurrency_wrapper)
 
+        ###########################
+        # Cache Policy
+        ###########################
+        # Each entry may declare 'cache_policy' alongside its REST methods. Iface_watch enforces it for GET.
+        # 'lifespan'             : Seconds a response is cached for. Defaults to ProtonConfig.CACHE_LIFESPAN.
+        # 'vary_by'              : List of query params that vary the cache key. Defaults to all query params.
+        # 'bypass'               : True to never cache responses of this entry.
+        # 'per_user'             : True to cache responses separately for each authenticated user.
+        # 'empty_result_lifespan': Seconds an empty response ([], {}) is cached for. 0 to not cache empty responses.
+        #                          Defaults to 'lifespan'.
+        # 'max_body_size'        : Responses larger than this (in bytes) are not cached. Defaults to no limit.
+        # 'tables'               : List of tables responses are read from. Inserts/updates/deletes to any of these
+        #                          through self.transaction invalidate cached responses. Defaults to target table of
+        #                          the MIC.
+
         :return: serialized response ready for transmission to Interface.
         """
 
@@ -223,7 +240,10 @@ class Ctrl_{{ controllerName }}(Model_{{ modelName }}, Parallel_Programming, Con
             return json.dumps(default_concurrency_response)
 
         return {
-            "default": {'get': proton_default_get, 'post': proton_default_post},  # Supported methods are 'get', 'post'.
+            "default": {'get': proton_default_get, 'post': proton_default_post,  # Supported methods are 'get', 'post'.
+                        'cache_policy': {'lifespan': ProtonConfig.CACHE_LIFESPAN, 'vary_by': None, 'bypass': False,
+                                         'per_user': False, 'empty_result_lifespan': 60, 'max_body_size': None,
+                                         'tables': None}},
             "default_http_concurrency": {'get': proton_multi_threaded_http_op}
             # Similar to above, add more processor methods according to developer's convenience.
         }
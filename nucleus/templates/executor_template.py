@@ -30,6 +30,7 @@ from falcon_apispec import FalconPlugin
 from falcon_cors import CORS
 from mic.iface.middlewares.iface_watch import Iface_watch
 from mic.iface.middlewares.proton_prometheus import ProtonPrometheus
+from mic.iface.middlewares.request_timing import RequestTiming
 from mic.iface.middlewares.token_authenticator import TokenAuthenticator
 from nucleus.iam.login import IctrlProtonLogin
 from nucleus.iam.signup import IctrlProtonSignup
@@ -63,6 +64,7 @@ class DefaultRouteHandler(object):
         response['availableRoutes'].append('/signup')
         response['availableRoutes'].append('/proton-prom')
         response['availableRoutes'].append('/proton-grafana')
+        response['availableRoutes'].append('/ready')
         {%for route in routes %}
         response['availableRoutes'].append('/{{ route.routeName }}')
         {% endfor %}
@@ -81,6 +83,28 @@ class FastServe(object):
     def on_get(self, req, resp):
         resp.status = falcon.HTTP_200
 
+
+class Readiness(object):
+    """
+    Readiness of this worker; it is ready once cache warm-up is complete. Use ?wait=<seconds> to wait for warm-up
+    (up to 30 seconds) before responding.
+    """
+
+    def __init__(self, iface_watch):
+        super(Readiness, self).__init__()
+        self.iface_watch = iface_watch
+
+    def on_get(self, req, resp):
+        wait = min(max(req.get_param_as_int('wait') or 0, 0), 30)
+        if self.iface_watch.cache_warm.wait(wait):
+            resp.body = json.dumps({'ready': True})
+            resp.status = falcon.HTTP_200
+        else:
+            resp.body = json.dumps({'ready': False, 'message': 'Cache warm-up is in progress.'})
+            resp.status = falcon.HTTP_503
+            resp.set_header('Retry-After', '1')
+
+
 class RedirectToProm(object):
     """
     This is a 301 re-direction to Prometheus UI
@@ -108,8 +132,10 @@ class RedirectToGrafana(object):
 
 
 prom = ProtonPrometheus()
+iface_watch = Iface_watch()
 cors = CORS(allow_all_origins=['http://localhost:{{ port }}'])
-app = falcon.API(middleware=[TokenAuthenticator(), cors.middleware, Iface_watch(), prom])
+# RequestTiming must remain the first middleware; it times all the others.
+app = falcon.API(middleware=[RequestTiming(), TokenAuthenticator(), cors.middleware, iface_watch, prom])
 
 app.add_route('/', DefaultRouteHandler())
 app.add_route('/fast-serve', FastServe())
@@ -118,6 +144,7 @@ app.add_route('/signup', IctrlProtonSignup())
 app.add_route('/metrics', prom)
 app.add_route('/proton-prom', RedirectToProm())
 app.add_route('/proton-grafana', RedirectToGrafana())
+app.add_route('/ready', Readiness(iface_watch))
 
 {% for route in routes %}
 rc_{{ route.controllerName }} =  {{ route.controllerName }}()
@@ -125,8 +152,12 @@ rc_{{ route.controllerName }} =  {{ route.controllerName }}()
 
 {% for route in routes %}
 app.add_route('/{{ route.routeName }}', rc_{{ route.controllerName }})
+iface_watch.register_route('/{{ route.routeName }}', rc_{{ route.controllerName }})
 {% endfor %}
 
+# Warm cache for hot routes (ProtonConfig.CACHE_WARMUP_ROUTES) in background; /ready reports its completion.
+iface_watch.warm_up()
+
 # Open API Specs
 spec = APISpec(
     title='PROTON STACK',
@@ -27,6 +27,7 @@ import json
 from colorama import Fore
 from colorama import Style
 from configuration import ProtonConfig
+from nucleus.generics.request_timer import RequestTimer
 from nucleus.generics.utilities import MyUtilities
 {% for controller in iCtrlHash %}
 from mic.controllers.{{ controller.fileName }} import {{ controller.controllerName }}
@@ -50,6 +51,8 @@ class Ictrl_get_{{controller.micName}}_{{controller.iControllerName}}({{controll
         super(Ictrl_get_{{controller.micName}}_{{controller.iControllerName}}, self).__init__()
         self.ictrl_{{controller.iControllerName}}_logger = self.get_logger(log_file_name='{{ controller.micName }}',
                                                                            log_file_path='{}/trace/{{ controller.micName }}.log'.format(self.ROOT_DIR))
+        self.mic_name = '{{ controller.micName }}'
+        self.cache_policy = self.controller_processor()['{{ controller.iControllerName }}'].get('cache_policy', {})
 
     def on_get(self, req, resp):
         """
@@ -64,12 +67,27 @@ class Ictrl_get_{{controller.micName}}_{{controller.iControllerName}}({{controll
                     description: <Add description relevant to GET. This will be picked by Swagger generator>
                     schema: <Schema of Response>
         """
+        response, resp.status = self.get_response(dict(req.params.items()))
+        if response is None or isinstance(response, (str, bytes)):
+            resp.body = response
+        else:
+            # Streaming getters (getter['stream_model_data']) return an iterable of encoded chunks.
+            resp.stream = response
+
+    def get_response(self, query_params_kwargs):
+        """
+        Services GET for given query params; independent of falcon's request & response. Iface_watch relies on this
+        to refresh cached responses outside of request cycle.
+
+        :param query_params_kwargs: Any/All query params passed to this route packaged into a dictionary.
+        :return: A tuple of response & status.
+        """
         try:
             # If you have newer methods available under Controller, reference that below as per your convenience.
-            print(Fore.BLUE + 'Request for route {} is being serviced by conventional db service of '
-                              'PROTON stack'.format(req) + Style.RESET_ALL)
-            query_params_kwargs = dict(req.params.items())
-            response = self.controller_processor()['{{ controller.iControllerName }}']['{{ methodName }}'](self.TARGET_DB, query_params_kwargs)
+            print(Fore.BLUE + 'Request for {{ controller.micName }}_{{ controller.iControllerName }} is being serviced by '
+                              'conventional db service of PROTON stack' + Style.RESET_ALL)
+            with RequestTimer.measure('controller'):
+                response = self.controller_processor()['{{ controller.iControllerName }}']['{{ methodName }}'](self.TARGET_DB, query_params_kwargs)
             status = falcon.HTTP_200
         except Exception as e:
             response = json.dumps({'message': 'Server has failed to service this request.',
@@ -78,9 +96,7 @@ class Ictrl_get_{{controller.micName}}_{{controller.iControllerName}}({{controll
             print(Fore.LIGHTRED_EX + '[Ictrl_{{ controller.iControllerName }}]: GET is unsuccessful. '
                                      'InterfaceController has returned HTTP 500 to client. '
                                      'Exception Details: {}'.format(str(e)) + Style.RESET_ALL)
-        finally:
-            resp.body = response
-            resp.status = status
+        return response, status
 
 {% elif methodName == 'post' %}
 
@@ -125,7 +141,8 @@ class Ictrl_post_{{controller.micName}}_{{controller.iControllerName}}({{control
             validity = MyUtilities.validate_proton_post_payload(post_payload)
 
             if validity:
-                post_response = self.controller_processor()['{{ controller.iControllerName }}']['{{ methodName }}'](post_payload['db_flavour'], post_payload['db_name'], post_payload['schema_name'], post_payload['table_name'], post_payload['payload'])
+                with RequestTimer.measure('controller'):
+                    post_response = self.controller_processor()['{{ controller.iControllerName }}']['{{ methodName }}'](post_payload['db_flavour'], post_payload['db_name'], post_payload['schema_name'], post_payload['table_name'], post_payload['payload'])
                 response = post_response
                 status = falcon.HTTP_201
             else:
@@ -43,7 +43,9 @@ class IFetch(object):
         rest_methods_per_exposed_method = []
         for key in {{controller.controllerName}}().controller_processor():
             rest_methods_per_exposed_method.append({
-                key: list({{controller.controllerName}}().controller_processor()[key].keys())
+                # cache_policy accompanies REST methods of an entry; it is not a REST method by itself.
+                key: [method for method in {{controller.controllerName}}().controller_processor()[key].keys()
+                      if method != 'cache_policy']
             })
 
         controller_methods.append({'{{ controller.micName }}': {
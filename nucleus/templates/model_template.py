@@ -22,12 +22,21 @@
 # WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json
 import pandas as pd
+import uuid
 from colorama import Fore
 from colorama import Style
+from contextlib import closing, ExitStack
 from jinjasql import JinjaSql
+from nucleus.db.bulk_loader import BulkLoader
+from nucleus.db.cache_key_builder import CacheKeyBuilder
+from nucleus.db.cache_manager import CacheManager
 from nucleus.db.connection_manager import ConnectionManager
+from nucleus.db.local_cache import LocalCache
+from nucleus.db.query_template_cache import QueryTemplateCache
+from nucleus.db.row_encoder import RowEncoder
+from nucleus.db.row_stream import RowStream
+from nucleus.generics.request_timer import RequestTimer
 from nucleus.generics.utilities import MyUtilities
 
 __author__ = "Pruthvi Kumar, pruthvikumar.123@gmail.com"
@@ -50,8 +59,12 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
             # TODO: Add cursorGenerators for MYSQL and SQL Server when they are available within ConnectionManager.
         }
         self.__j_sql = JinjaSql(param_style='named')
+        # SQL templates are compiled once per distinct SQL; see QueryTemplateCache.
+        self.__query_templates = QueryTemplateCache(self.__j_sql, self.QUERY_TEMPLATE_CACHE_SIZE,
+                                                    self.generate_sql_template)
         self.__cursor_engine = self.connection_store()
         self.__alchemy_engine = self.alchemy_engine()
+        self.__cache_manager = CacheManager.cache_processor()
 
         self.model_{{ modelName }}_logger = self.get_logger(log_file_name='{{ modelName }}',
                                                             log_file_path='{}/trace/{{ modelName }}.log'.format(self.ROOT_DIR))
@@ -69,6 +82,86 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
         """.format(sql)
         return template
 
+    def __invalidate_cache(self, tables):
+        """
+        Invalidate cached responses read from given tables. Called once a write to those tables is committed.
+        :param tables: A list of table names.
+        :return: void
+        """
+        if not tables:
+            return
+        tags = [CacheKeyBuilder.tag(table) for table in tables]
+        # L1 of this worker; L1 of other workers is not reached and may serve for up to CACHE_L1_LIFESPAN.
+        LocalCache.invalidate_tags_in_process(tags)
+        cache_instance = self.__cache_manager['init_cache']()
+        if cache_instance is not None:
+            invalidated_count = self.__cache_manager['invalidate_tags_from_cache'](cache_instance, tags)
+            self.model_{{ modelName }}_logger.info('[{{modelName}}]: {} cached responses invalidated after write to '
+                                                   '{}.'.format(invalidated_count, tables))
+
+    def __record_write(self, tables=None):
+        """
+        Record a committed write to postgres. Reads of given tables stay on primary rather than read replicas for
+        REPLICA_READ_AFTER_WRITE_WINDOW seconds; in this worker and, through write markers in redis, in every other.
+        :param tables: A list of table names; None if not known, in which case all reads stay on primary.
+        :return: void
+        """
+        if not self.replicas_enabled():
+            return
+        self.record_write(tables)
+        cache_instance = self.__cache_manager['init_cache']()
+        if cache_instance is not None and self.REPLICA_READ_AFTER_WRITE_WINDOW > 0:
+            self.__cache_manager['set_many_to_cache'](
+                cache_instance, [(marker, 1) for marker in CacheKeyBuilder.write_markers(tables)],
+                lifespan=self.REPLICA_READ_AFTER_WRITE_WINDOW)
+
+    def __read_from_replica(self, tables):
+        """
+        :param tables: A list of table names read; empty if not known.
+        :return: Bool indicating if a read may be served by a read replica; False if any worker recorded a write
+        concerning the read within REPLICA_READ_AFTER_WRITE_WINDOW seconds. Should redis be unavailable, only writes of
+        this worker are known (ReplicaRouter).
+        """
+        if not self.replicas_enabled():
+            return False
+        cache_instance = self.__cache_manager['init_cache']()
+        if cache_instance is None or self.REPLICA_READ_AFTER_WRITE_WINDOW <= 0:
+            return True
+        markers = self.__cache_manager['get_many_from_cache'](cache_instance, CacheKeyBuilder.read_markers(tables))
+        return not any(marker is not None for marker in markers or [])
+
+    def __bulk_insert(self, db_flavour, schema_name, table_name, input_payload):
+        """
+        Bulk load rows into an existing table; COPY for postgres & executemany for sqlite. All or nothing.
+        :param input_payload: A list of dictionaries consistent in terms of keys.
+        :return: Bool; False if table does not exist yet, in which case nothing is loaded.
+        """
+        engine = self.__alchemy_engine[db_flavour]
+        if not input_payload or not self.has_table(engine, table_name,
+                                                   None if db_flavour == 'sqlite' else schema_name):
+            return False
+
+        columns = list(input_payload[0].keys())
+        rows = ([record[column] for column in columns] for record in input_payload)
+        with RequestTimer.measure('db'):
+            if db_flavour == 'sqlite':
+                loaded_count = BulkLoader.executemany_to_sqlite(self.sqlite_connection_generator(), table_name, columns,
+                                                                rows, self.BULK_INSERT_CHUNK_SIZE)
+            else:
+                connection = engine.raw_connection()
+                try:
+                    with closing(connection.cursor()) as cursor:
+                        loaded_count = BulkLoader.copy_to_postgres(cursor, schema_name, table_name, columns, rows,
+                                                                   self.BULK_INSERT_CHUNK_SIZE)
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+                finally:
+                    connection.close()
+        self.model_{{ modelName }}_logger.info('[{{modelName}}]: {} rows bulk loaded into {}.'.format(loaded_count, table_name))
+        return True
+
     def __getter(self):
         """
         Safe getter.
@@ -101,38 +194,84 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
             :return:
             """
             if db_flavour == 'sqlite':
-                # lite database
+                # lite database. Connection is held by this thread for subsequent requests; so, it is not closed here.
+                connection = None
+                cursor = None
                 try:
-                    connection = self.sqlite_connection_generator()
+                    connection = self.sqlite_connection_generator(read_only=True)
                     cursor = connection.cursor()
-                    query, bind_params = self.__j_sql.prepare_query(self.generate_sql_template(sql), binding_params)
-                    cursor.execute(query, binding_params)
-                    results = cursor.fetchall()
-                    results_df = pd.DataFrame(results, columns=[desc[0] for desc in cursor.description])
-                    return results_df.to_json(orient='records')
+                    query, bind_params = self.__query_templates.prepare(sql, binding_params)
+                    with RequestTimer.measure('db'):
+                        cursor.execute(query, bind_params)
+                        results = cursor.fetchall()
+                    with RequestTimer.measure('serialization'):
+                        return RowEncoder.from_cursor(cursor).encode(results)
                 except Exception as e:
-                    connection.rollback()
+                    if connection is not None:
+                        connection.rollback()
                     self.model_{{ modelName }}_logger.exception('[{{modelName}}] - Exception during GETTER. Details: {}'.format(str(e)))
                     print(Fore.LIGHTRED_EX + '[{{modelName}}] - Exception during GETTER. '
                                              'Details: {}'.format(str(e)) + Style.RESET_ALL)
                 finally:
-                    connection.close()
+                    if cursor is not None:
+                        cursor.close()
             else:
                 # Prodgrade databases
                 try:
-                    with self.__db_flavour_to_cursor_generator_map[db_flavour](self.__cursor_engine) as cursor:
-                        query, bind_params = self.__j_sql.prepare_query(self.generate_sql_template(sql), binding_params)
-                        cursor.execute(query, bind_params)
-                        results = cursor.fetchall()
-                        return json.dumps(results)
+                    # Reads are served by a read replica, if any; see ConnectionManager.
+                    tables = CacheKeyBuilder.tables_read(sql)
+                    with self.__db_flavour_to_cursor_generator_map[db_flavour](
+                            self.__cursor_engine, read_only=self.__read_from_replica(tables), tables=tables) as cursor:
+                        query, bind_params = self.__query_templates.prepare(sql, binding_params)
+                        with RequestTimer.measure('db'):
+                            cursor.execute(query, bind_params)
+                            results = cursor.fetchall()
+                        with RequestTimer.measure('serialization'):
+                            return RowEncoder.from_cursor(cursor).encode(results)
 
                 except Exception as e:
                     self.model_{{ modelName }}_logger.exception('[{{modelName}}] - Exception during GETTER. Details: {}'.format(str(e)))
                     print(Fore.LIGHTRED_EX + '[{{modelName}}] - Exception during GETTER. '
                                              'Details: {}'.format(str(e)) + Style.RESET_ALL)
 
+        def stream_data_for_model(db_flavour, sql, binding_params, chunk_size=None):
+            """
+            Streaming variant of get_model_data for large reads. Query is executed right away; rows are fetched &
+            encoded chunk_size at a time as the response is sent. Postgres rows are read over a server side (named)
+            cursor; so, neither PROTON nor psycopg2 holds the entire result in memory.
+
+                resp.stream = self.getter['stream_model_data'](db_flavour, sql, binding_params)
+
+            Streamed responses are not cached by Iface_watch.
+
+            :param sql: Template; as in get_model_data.
+            :param binding_params: Template; as in get_model_data.
+            :param chunk_size: Rows fetched at a time. Defaults to ProtonConfig.STREAM_CHUNK_SIZE.
+            :return: RowStream yielding a JSON array of records; None if query is unsuccessful.
+            """
+            resources = ExitStack()
+            try:
+                if db_flavour == 'sqlite':
+                    cursor = resources.enter_context(
+                        closing(self.sqlite_connection_generator(read_only=True).cursor()))
+                else:
+                    tables = CacheKeyBuilder.tables_read(sql)
+                    cursor = resources.enter_context(self.__db_flavour_to_cursor_generator_map[db_flavour](
+                        self.__cursor_engine, 'proton_stream_{}'.format(uuid.uuid4().hex),
+                        read_only=self.__read_from_replica(tables), tables=tables))
+                query, bind_params = self.__query_templates.prepare(sql, binding_params)
+                with RequestTimer.measure('db'):
+                    cursor.execute(query, bind_params)
+                return RowStream(cursor, chunk_size or self.STREAM_CHUNK_SIZE, on_close=resources.close)
+            except Exception as e:
+                resources.close()
+                self.model_{{ modelName }}_logger.exception('[{{modelName}}] - Exception during streaming GETTER. Details: {}'.format(str(e)))
+                print(Fore.LIGHTRED_EX + '[{{modelName}}] - Exception during streaming GETTER. '
+                                         'Details: {}'.format(str(e)) + Style.RESET_ALL)
+
         return {
             "get_model_data": get_data_for_model,
+            "stream_model_data": stream_data_for_model,
             # For other getters, create respective closures and extend this dictionary accordingly to your convenience.
         }
 
@@ -143,42 +282,59 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
         :return:
         """
 
-        def perform_insert_operation(db_flavour, db_name, schema_name, table_name, input_payload):
+        def perform_insert_operation(db_flavour, db_name, schema_name, table_name, input_payload, bulk=None):
             """
             Closure for Insert Operation!
             This is also a proxy for CREATE operation. If table does not exist, SQL Alchemy will create one.
             The newly created table will have best matching data type for each column.
 
+            Rows for tables that exist are bulk loaded; COPY for postgres & a single executemany transaction for
+            sqlite; in chunks of BULK_INSERT_CHUNK_SIZE rows.
+
             :param input_payload: A dictionary which is Pandas Ready.
                 eg. [{'column-1': value, 'column-2: value, column-3: value },
                 {'column-1': value, 'column-2: value, column-3: value }]
             :param db_flavour: One of the supported versions. Must have an entry in dataBaseConfig.ini
             :param db_name: Name of target Database
             :param table_name: table_name into which the given payload is to be uploaded.
+            :param bulk: Bulk load into existing tables. Defaults to ProtonConfig.BULK_INSERT_ENABLED; False to insert
+            through pandas regardless.
             :return: A boolean indicating success/failure of Insert Operation.
             """
-            # Do this with SQL Alchemy and Pandas.
+            insert_status = False
+            connection = None
             consistency_of_keys = self.validate_list_of_dicts_consistency(input_payload)
             if consistency_of_keys:
                 try:
-                    data_to_be_inserted = pd.DataFrame(input_payload)
-                    connection = self.__alchemy_engine[db_flavour].connect()
-                    with connection.begin() as transaction:
-                        if db_flavour == 'sqlite':
-                            data_to_be_inserted.to_sql(table_name, self.__alchemy_engine[db_flavour], index=False,
-                                                       if_exists='append')
-                        else:
-                            # check if schema exists & create one if not.
-                            schema_status = self.pg_schema_generator(self.__alchemy_engine[db_flavour], schema_name)
-                            if schema_status:
+                    if self.BULK_INSERT_ENABLED if bulk is None else bulk:
+                        insert_status = self.__bulk_insert(db_flavour, schema_name, table_name, input_payload)
+                    if not insert_status:
+                        # Do this with SQL Alchemy and Pandas.
+                        data_to_be_inserted = pd.DataFrame(input_payload)
+                        connection = self.__alchemy_engine[db_flavour].connect()
+                        with RequestTimer.measure('db'), connection.begin() as transaction:
+                            if db_flavour == 'sqlite':
                                 data_to_be_inserted.to_sql(table_name, self.__alchemy_engine[db_flavour], index=False,
-                                                           if_exists='append', schema=schema_name)
+                                                           if_exists='append')
+                                insert_status = True
                             else:
-                                self.model_{{ modelName }}_logger.info('[{{modelName}}]: Schema specified not found. Insert operation could '
-                                                 'not be completed. Check connectionManager logs for stack trace.')
-                        transaction.commit()
-                    connection.close()
+                                # check if schema exists & create one if not.
+                                schema_status = self.pg_schema_generator(self.__alchemy_engine[db_flavour], schema_name)
+                                if schema_status:
+                                    data_to_be_inserted.to_sql(table_name, self.__alchemy_engine[db_flavour], index=False,
+                                                               if_exists='append', schema=schema_name)
+                                    insert_status = True
+                                else:
+                                    self.model_{{ modelName }}_logger.info('[{{modelName}}]: Schema specified not found. Insert operation could '
+                                                     'not be completed. Check connectionManager logs for stack trace.')
+                            transaction.commit()
+                        connection.close()
+                    if insert_status:
+                        if db_flavour == 'postgresql':
+                            self.__record_write([table_name])
+                        self.__invalidate_cache([table_name])
                 except Exception as e:
+                    insert_status = False
                     self.model_{{ modelName }}_logger.exception('[{{modelName}}]: {}'.format(str(e)))
                     print(Fore.LIGHTRED_EX + '[{{modelName}}]: {}'.format(str(e)) + Style.RESET_ALL)
                     if connection:
@@ -186,11 +342,13 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
                 finally:
                     if connection:
                         connection.close()
+                return insert_status
             else:
                         self.model_{{ modelName }}_logger.exception('[{{modelName}}]: To perform successful INSERT operation, ensure the input list '
                                               'of dictionaries is consistent in terms of `keys`.')
                         print(Fore.LIGHTRED_EX + '[{{modelName}}]: To perform successful INSERT operation, ensure the input '
                               'list of dictionaries is consistent in terms of `keys`.' + Style.RESET_ALL)
+                        return False
 
         def perform_update_or_delete_operation(sql, binding_params):
             """
@@ -222,10 +380,16 @@ class Model_{{ modelName }}(ConnectionManager, MyUtilities):
 
             try:
                 with self.pg_cursor_generator(self.__cursor_engine) as cursor:
-                    query, bind_params = self.__j_sql.prepare_query(self.generate_sql_template(sql), binding_params)
-                    cursor.execute(query, bind_params)
-                    cursor.commit()
-                    return True
+                    query, bind_params = self.__query_templates.prepare(sql, binding_params)
+                    with RequestTimer.measure('db'):
+                        cursor.execute(query, bind_params)
+                        cursor.connection.commit()
+                self.__record_write(CacheKeyBuilder.tables_written(sql) or None)
+                if self.is_ddl(sql):
+                    # Schema changed; reflected metadata cached by ConnectionManager is stale.
+                    self.invalidate_metadata()
+                self.__invalidate_cache(CacheKeyBuilder.tables_written(sql))
+                return True
             except Exception as e:
                 self.model_{{ modelName }}_logger.exception('[{{modelName}} - Exception during UPDATE operation. Details: {}]'.format(str(e)))
                 print(Fore.LIGHTRED_EX + '[{{modelName}} -  Exception during UPDATE operation. Details: '
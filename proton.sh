@@ -92,6 +92,11 @@ else
         eval "$(grep ^PG_USERNAME= .env)"
         eval "$(grep ^PG_PASSWORD= .env)"
         eval "$(grep ^PG_TARGET_PORT= .env)"
+        eval "$(grep ^PG_POOL_MIN_SIZE= .env)"
+        eval "$(grep ^PG_POOL_MAX_SIZE= .env)"
+        eval "$(grep ^PG_POOL_MAX_OVERFLOW= .env)"
+        eval "$(grep ^PG_POOL_TIMEOUT= .env)"
+        eval "$(grep ^PG_REPLICA_HOSTS= .env)"
 
     elif [[ "$environment" == 'test' ||  "$protonTest" == 'yes' ]]; then
 
@@ -104,6 +109,11 @@ else
         eval "$(grep ^PG_USERNAME= .test-env)"
         eval "$(grep ^PG_PASSWORD= .test-env)"
         eval "$(grep ^PG_TARGET_PORT= .test-env)"
+        eval "$(grep ^PG_POOL_MIN_SIZE= .test-env)"
+        eval "$(grep ^PG_POOL_MAX_SIZE= .test-env)"
+        eval "$(grep ^PG_POOL_MAX_OVERFLOW= .test-env)"
+        eval "$(grep ^PG_POOL_TIMEOUT= .test-env)"
+        eval "$(grep ^PG_REPLICA_HOSTS= .test-env)"
 
     else
         :
@@ -118,8 +128,27 @@ database=$PG_TARGET_DB
 user=$PG_USERNAME
 password=$PG_PASSWORD
 port=$PG_TARGET_PORT
+pool_min_size=${PG_POOL_MIN_SIZE:-1}
+pool_max_size=${PG_POOL_MAX_SIZE:-25}
+pool_max_overflow=${PG_POOL_MAX_OVERFLOW:-5}
+pool_timeout=${PG_POOL_TIMEOUT:-30}
 EOF
 
+    # Read replicas of postgres; PG_REPLICA_HOSTS="host[:port[:weight]],..." Each gets a [postgresql_replica_<n>]
+    # section. Replicas share database, credentials & pool sizing of primary.
+    replica_index=0
+    IFS=',' read -ra replica_hosts <<< "$PG_REPLICA_HOSTS"
+    for replica in "${replica_hosts[@]}"; do
+        IFS=':' read -r replica_host replica_port replica_weight <<< "$replica"
+        replica_index=$((replica_index + 1))
+        cat << EOF >> ./databaseConfig.ini
+[postgresql_replica_${replica_index}]
+host=$replica_host
+port=${replica_port:-$PG_TARGET_PORT}
+weight=${replica_weight:-1}
+EOF
+    done
+
     # Generate PROTON JWT Secret if it doesn't already exist.
     if [[ ! -e nucleus/iam/secrets/PROTON_JWT_SECRET.txt ]]; then
         mkdir -p nucleus/iam/secrets
@@ -60,16 +60,15 @@ class ProtonKill(CacheManager):
     def destroy_mic_stack(self, mic_name):
 
         try:
-            # Delete cache entry for all methods of micStack intended for deletion
-            cache_instance = self.cache_processor()['init_cache']()
-            from nucleus.iextractor import IExtractor
-            iface_methods_in_proton_stack = IExtractor(mic_name).keys_of_requested_controller
-
-            for method in iface_methods_in_proton_stack:
-                self.cache_processor()['delete_from_cache'](cache_instance, 'c_{}_{}'.format(mic_name, method))
-                self.cache_processor()['delete_from_cache'](cache_instance, 'c_setTime_{}_{}'.format(mic_name, method))
-                self.protonkill_logger.info(
-                    'Cache entry for mic stack of "{}" is deleted successfully!'.format(mic_name))
+            # Delete cache entries of all routes of micStack intended for deletion. Cache keys are namespaced by MIC.
+            # Keys are scanned and UNLINKed in batches; one round trip per batch rather than per key.
+            from nucleus.db.cache_key_builder import CacheKeyBuilder
+            cache_manager = self.cache_processor()
+            cache_instance = cache_manager['init_cache']()
+            deleted_count = cache_manager['delete_by_prefix_from_cache'](cache_instance,
+                                                                         CacheKeyBuilder.prefix(mic_name))
+            self.protonkill_logger.info('{} cache entries for mic stack of "{}" are deleted successfully!'.format(
+                deleted_count, mic_name))
 
             model_path = '{}/mic/models/{}'.format(self.ROOT_DIR, mic_name)
             controller_path = '{}/mic/controllers/controller_{}.py'.format(self.ROOT_DIR, mic_name)
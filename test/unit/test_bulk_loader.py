@@ -0,0 +1,65 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import datetime
+import sqlite3
+from nucleus.db.bulk_loader import BulkLoader
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestBulkLoader(TestCase):
+
+    def test_executemany_to_sqlite(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE employee (id INTEGER, name TEXT)')
+        rows = ((i, 'e{}'.format(i)) for i in range(25))
+        assert BulkLoader.executemany_to_sqlite(connection, 'employee', ['id', 'name'], rows, chunk_size=10) == 25
+        assert connection.execute('SELECT COUNT(*), MAX(id) FROM employee').fetchone() == (25, 24)
+
+        # Load is all or nothing.
+        rows = [(100, 'ok'), (101, 'ok', 'extra')]
+        self.assertRaises(sqlite3.Error, BulkLoader.executemany_to_sqlite, connection, 'employee', ['id', 'name'],
+                          rows, 1)
+        assert connection.execute('SELECT COUNT(*) FROM employee').fetchone() == (25,)
+        connection.close()
+
+    def test_copy_to_postgres(self):
+        class Cursor(object):
+            copied = []
+
+            def copy_expert(self, sql, buffer):
+                self.copied.append((sql, buffer.read()))
+
+        rows = [(1, 'tab\there', None, True, datetime.date(2018, 7, 1)), (2, 'new\nline\\', 1.5, False, {'a': 1})]
+        columns = ['id', 'name', 'score', 'active', 'note']
+        assert BulkLoader.copy_to_postgres(Cursor(), 'public', 'em"p', columns, rows, chunk_size=1) == 2
+        assert Cursor.copied == [
+            ('COPY "public"."em""p" ("id", "name", "score", "active", "note") FROM STDIN',
+             '1\ttab\\there\t\\N\tt\t2018-07-01\n'),
+            ('COPY "public"."em""p" ("id", "name", "score", "active", "note") FROM STDIN',
+             '2\tnew\\nline\\\\\t1.5\tf\t{"a": 1}\n')]
@@ -0,0 +1,88 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import fakeredis
+from nucleus.db.cache_manager import CacheManager
+from nucleus.db.sharded_redis import ShardedRedis
+from unittest import mock, TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestCacheBulkOperations(TestCase):
+
+    def setUp(self):
+        self.cache_manager = CacheManager.cache_processor()
+        self.nodes = {'node-{}'.format(node): fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+                      for node in 'abc'}
+        self.redis_instance = ShardedRedis(self.nodes)
+
+        # Small batches; so, every node is written & read in more than one batch.
+        batch_size = mock.patch.object(CacheManager, 'REDIS_BULK_BATCH_SIZE', 4)
+        batch_size.start()
+        self.addCleanup(batch_size.stop)
+
+        self.items = [('c:employee:{}'.format(index), 'value-{}'.format(index).encode()) for index in range(30)]
+
+    def test_keys_are_spread_across_nodes(self):
+        self.cache_manager['set_many_to_cache'](self.redis_instance, self.items, 60)
+        assert all(client.dbsize() > 0 for client in self.nodes.values())
+        assert sum(client.dbsize() for client in self.nodes.values()) == len(self.items)
+
+    def test_set_many_and_get_many_keep_order(self):
+        set_status = self.cache_manager['set_many_to_cache'](self.redis_instance, self.items, 60)
+        assert set_status == [True] * len(self.items)
+
+        keys = [key for key, value in reversed(self.items)]
+        data_from_cache = self.cache_manager['get_many_from_cache'](self.redis_instance, keys)
+        assert data_from_cache == [value for key, value in reversed(self.items)]
+
+    def test_get_many_returns_none_for_missing_keys(self):
+        self.cache_manager['set_many_to_cache'](self.redis_instance, dict(self.items[:10]), 60)
+        keys = ['c:missing:1'] + [key for key, value in self.items[:10]] + ['c:missing:2']
+        data_from_cache = self.cache_manager['get_many_from_cache'](self.redis_instance, keys)
+        assert data_from_cache == [None] + [value for key, value in self.items[:10]] + [None]
+
+    def test_delete_many_reports_presence_in_order(self):
+        self.cache_manager['set_many_to_cache'](self.redis_instance, self.items[:10], 60)
+        keys = [self.items[0][0], 'c:missing:1', self.items[5][0], self.items[9][0]]
+        deleted_status = self.cache_manager['delete_many_from_cache'](self.redis_instance, keys)
+        assert deleted_status == [True, False, True, True]
+        data_from_cache = self.cache_manager['get_many_from_cache'](
+            self.redis_instance, [key for key, value in self.items[:10]])
+        assert [data is None for data in data_from_cache] == [index in (0, 5, 9) for index in range(10)]
+
+    def test_delete_by_prefix_is_scoped_to_prefix(self):
+        self.cache_manager['set_many_to_cache'](self.redis_instance, self.items, 60)
+        other_items = [('c:project:{}'.format(index), b'other') for index in range(10)]
+        self.cache_manager['set_many_to_cache'](self.redis_instance, other_items, 60)
+
+        assert self.cache_manager['delete_by_prefix_from_cache'](self.redis_instance, 'c:employee:') == len(self.items)
+        assert self.cache_manager['get_many_from_cache'](
+            self.redis_instance, [key for key, value in self.items]) == [None] * len(self.items)
+        assert self.cache_manager['get_many_from_cache'](
+            self.redis_instance, [key for key, value in other_items]) == [b'other'] * len(other_items)
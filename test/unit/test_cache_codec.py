@@ -0,0 +1,55 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from nucleus.db.cache_codec import CacheCodec
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestCacheCodec(TestCase):
+
+    def test_round_trip(self):
+        entry = CacheCodec.encode('{"a": 1}', 'application/json', 100.5, 0.25)
+        decoded = CacheCodec.decode(entry)
+        assert decoded == {'body': b'{"a": 1}', 'content_type': 'application/json',
+                           'etag': CacheCodec.etag(b'{"a": 1}'), 'expires_at': 100.5, 'delta': 0.25}
+
+    def test_etag(self):
+        assert CacheCodec.etag('{"a": 1}') == CacheCodec.etag(b'{"a": 1}')
+        assert CacheCodec.etag(b'{"a": 1}') != CacheCodec.etag(b'{"a": 2}')
+        entry = CacheCodec.encode(b'{}', 'application/json', 0, 0, etag='abc')
+        assert CacheCodec.decode(entry)['etag'] == 'abc'
+
+    def test_large_bodies_are_compressed(self):
+        body = b'[' + b'{"name": "proton"},' * 500 + b'{}]'
+        entry = CacheCodec.encode(body, 'application/json', 0, 0, compression_threshold=1024)
+        assert len(entry) < len(body)
+        assert CacheCodec.decode(entry)['body'] == body
+
+    def test_invalid_entries(self):
+        self.assertRaises(ValueError, CacheCodec.decode, b'{"body": "x"}')
+        self.assertRaises(ValueError, CacheCodec.decode, b'')
@@ -0,0 +1,75 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from nucleus.db.cache_key_builder import CacheKeyBuilder
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestCacheKeyBuilder(TestCase):
+
+    def test_params_are_canonical(self):
+        key_1 = CacheKeyBuilder.build('employee', 'get', '/get_employee_details', {'a': '1', 'b': '2'})
+        key_2 = CacheKeyBuilder.build('employee', 'GET', '/get_employee_details', {'b': '2', 'a': '1'})
+        assert key_1 == key_2
+        assert key_1 == 'c:employee:GET:/get_employee_details:*:a=1&b=2'
+
+    def test_no_collisions(self):
+        assert (CacheKeyBuilder.build('employee', 'GET', '/get_x_a', {}) !=
+                CacheKeyBuilder.build('employee', 'GET', '/get_y_a', {}))
+        assert (CacheKeyBuilder.build('employee', 'GET', '/get_x', {'a': '1&b=2'}) !=
+                CacheKeyBuilder.build('employee', 'GET', '/get_x', {'a': '1', 'b': '2'}))
+
+    def test_vary_by_and_user_scope(self):
+        key = CacheKeyBuilder.build('employee', 'GET', '/get_x', {'a': '1', 'b': '2'}, vary_by=['a'],
+                                    user_scope='alice')
+        assert key == 'c:employee:GET:/get_x:u=alice:a=1'
+        assert key.startswith(CacheKeyBuilder.prefix('employee'))
+
+    def test_long_keys_are_hashed(self):
+        key = CacheKeyBuilder.build('employee', 'GET', '/get_x', {'a': 'v' * 1000})
+        assert len(key) <= CacheKeyBuilder.CACHE_KEY_MAX_LENGTH
+        assert key.startswith(CacheKeyBuilder.prefix('employee', 'GET', '/get_x') + '#')
+
+    def test_tags(self):
+        assert CacheKeyBuilder.tag('public."Employee"') == CacheKeyBuilder.tag('employee') == 't:employee'
+        assert CacheKeyBuilder.tables_written('UPDATE public.employee SET a = 1') == ['public.employee']
+        assert CacheKeyBuilder.tables_written('delete from project where id = {{ id }}') == ['project']
+        assert CacheKeyBuilder.tables_written('SELECT * FROM employee') == []
+        assert CacheKeyBuilder.tables_read('SELECT e.name FROM public.employee e JOIN "Project" p ON '
+                                           'e.id = p.employee_id') == ['public.employee', '"Project"']
+        assert CacheKeyBuilder.tables_read('SELECT * FROM employee e, project AS p,public.team WHERE e.id = p.id '
+                                           'ORDER BY e.name, p.name') == ['employee', 'project', 'public.team']
+        assert CacheKeyBuilder.tables_read('SELECT * FROM employee WHERE id IN (SELECT id FROM project, team)') == [
+            'employee', 'project', 'team']
+
+    def test_write_markers(self):
+        assert CacheKeyBuilder.write_markers(['public."Employee"']) == ['rw:employee', 'rw:*']
+        assert CacheKeyBuilder.write_markers() == ['rw:?', 'rw:*']
+        assert CacheKeyBuilder.read_markers(['employee', 'project']) == ['rw:employee', 'rw:project', 'rw:?']
+        assert CacheKeyBuilder.read_markers([]) == ['rw:*']
@@ -0,0 +1,68 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import fakeredis
+from nucleus.db.cache_manager import CacheManager
+from nucleus.db.sharded_redis import ShardedRedis
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestCacheTagVersions(TestCase):
+
+    def setUp(self):
+        self.cache_manager = CacheManager.cache_processor()
+        self.redis_instance = ShardedRedis({'node-a': fakeredis.FakeStrictRedis(),
+                                            'node-b': fakeredis.FakeStrictRedis()})
+
+    def test_response_computed_before_invalidation_is_not_set(self):
+        # Lookup misses; versions of tags are read before the response is computed.
+        tag_versions = self.cache_manager['get_tag_versions_from_cache'](self.redis_instance, ['t:employee'])
+        assert tag_versions == {'t:employee': 0}
+
+        # A write to employee is committed & invalidated while the response is being computed.
+        self.cache_manager['invalidate_tags_from_cache'](self.redis_instance, ['t:employee'])
+
+        self.cache_manager['set_many_with_tags_to_cache'](
+            self.redis_instance, [('c:stale', b'before write', 60, ['t:employee'], tag_versions)])
+        assert self.cache_manager['get_from_cache'](self.redis_instance, 'c:stale') is None
+
+    def test_response_computed_after_invalidation_is_set_and_invalidated(self):
+        self.cache_manager['invalidate_tags_from_cache'](self.redis_instance, ['t:employee'])
+        tag_versions = self.cache_manager['get_tag_versions_from_cache'](self.redis_instance,
+                                                                         ['t:employee', 't:project'])
+        assert tag_versions == {'t:employee': 1, 't:project': 0}
+
+        self.cache_manager['set_many_with_tags_to_cache'](
+            self.redis_instance, [('c:fresh', b'after write', 60, ['t:employee', 't:project'], tag_versions),
+                                  ('c:untagged', b'regardless', 60, ['t:project'], None)])
+        assert self.cache_manager['get_from_cache'](self.redis_instance, 'c:fresh') == b'after write'
+        assert self.cache_manager['get_from_cache'](self.redis_instance, 'c:untagged') == b'regardless'
+
+        assert self.cache_manager['invalidate_tags_from_cache'](self.redis_instance, ['t:project']) == 2
+        assert self.cache_manager['get_from_cache'](self.redis_instance, 'c:fresh') is None
@@ -0,0 +1,70 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+from nucleus.db.cache_writer import CacheWriter
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestCacheWriter(TestCase):
+
+    def test_batches_and_drops_on_overflow(self):
+        flushing = threading.Event()
+        proceed = threading.Event()
+        batches = []
+
+        def flush(writes):
+            flushing.set()
+            proceed.wait(5)
+            batches.append(writes)
+
+        writer = CacheWriter(flush, max_queue_size=2, batch_size=10)
+        assert writer.submit(1)
+        assert flushing.wait(5)
+        assert writer.submit(2)
+        assert writer.submit(3)
+        assert not writer.submit(4)
+        proceed.set()
+        writer.join()
+        assert batches == [[1], [2, 3]]
+        assert writer.pending() == 0
+
+    def test_flush_errors_are_swallowed(self):
+        batches = []
+
+        def flush(writes):
+            batches.append(writes)
+            if len(batches) == 1:
+                raise ConnectionError('redis is unavailable')
+
+        writer = CacheWriter(flush, max_queue_size=10, batch_size=10)
+        writer.submit(1)
+        writer.join()
+        writer.submit(2)
+        writer.join()
+        assert batches == [[1], [2]]
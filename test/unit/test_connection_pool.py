@@ -0,0 +1,122 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import sys
+import threading
+import time
+from nucleus.db.connection_pool import ConnectionPool, PoolTimeoutError
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class FakeConnection(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(TestCase):
+
+    def test_sizing_and_overflow(self):
+        pool = ConnectionPool(FakeConnection, min_size=1, max_size=2, max_overflow=1, timeout=0.05, name='test')
+        assert pool.stats() == {'in_use': 0, 'idle': 1, 'size': 1, 'waiters': 0}
+
+        connections = [pool.getconn() for _ in range(3)]
+        assert len(set(map(id, connections))) == 3
+        assert pool.stats()['in_use'] == 3
+        self.assertRaises(PoolTimeoutError, pool.getconn)
+
+        # Connection returned while pool is beyond max_size is closed; the rest are retained.
+        for connection in connections:
+            pool.putconn(connection)
+        assert [connection.closed for connection in connections] == [True, False, False]
+        assert pool.stats() == {'in_use': 0, 'idle': 2, 'size': 2, 'waiters': 0}
+
+        # Connections closed while idle are replaced.
+        connections[2].closed = True
+        assert pool.getconn() is connections[1]
+        replacement = pool.getconn()
+        assert replacement not in connections and not replacement.closed
+        assert pool.stats() == {'in_use': 2, 'idle': 0, 'size': 2, 'waiters': 0}
+
+    def test_waiter_gets_returned_connection(self):
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, max_overflow=0, timeout=2, name='test')
+        connection = pool.getconn()
+        checked_out = []
+        waiter = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+        waiter.start()
+        time.sleep(0.05)
+        assert pool.stats()['waiters'] == 1
+        pool.putconn(connection)
+        waiter.join(1)
+        assert checked_out == [connection]
+
+    def test_concurrent_checkouts_respect_capacity(self):
+        live = []
+        peak = [0]
+        count_lock = threading.Lock()
+
+        class CountedConnection(FakeConnection):
+
+            def close(self):
+                with count_lock:
+                    live.remove(self)
+                super(CountedConnection, self).close()
+
+        def connect():
+            connection = CountedConnection()
+            with count_lock:
+                live.append(connection)
+                peak[0] = max(peak[0], len(live))
+            return connection
+
+        def checkout(pool, barrier):
+            barrier.wait()
+            connection = pool.getconn()
+            time.sleep(0.001)
+            pool.putconn(connection)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            # Every round starts 20 checkouts at once against an empty pool.
+            for _ in range(20):
+                pool = ConnectionPool(connect, min_size=0, max_size=2, max_overflow=0, timeout=5, name='test')
+                barrier = threading.Barrier(20)
+                workers = [threading.Thread(target=checkout, args=(pool, barrier)) for _ in range(20)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join(10)
+                assert pool.stats() == {'in_use': 0, 'idle': 2, 'size': 2, 'waiters': 0}
+                pool.closeall()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert peak[0] <= 2
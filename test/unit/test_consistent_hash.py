@@ -0,0 +1,59 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from nucleus.generics.consistent_hash import ConsistentHash
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestConsistentHash(TestCase):
+
+    def setUp(self):
+        self.keys = ['c:proton:GET:/route_{}'.format(index) for index in range(3000)]
+
+    def test_distribution(self):
+        ring = ConsistentHash(['a', 'b', 'c'])
+        assert ring.nodes == ['a', 'b', 'c']
+        counts = {}
+        for key in self.keys:
+            counts[ring.get_node(key)] = counts.get(ring.get_node(key), 0) + 1
+        assert sorted(counts) == ['a', 'b', 'c']
+        assert min(counts.values()) > len(self.keys) / 3 * 0.7
+        assert ring.get_node(self.keys[0].encode('utf-8')) == ring.get_node(self.keys[0])
+        assert ConsistentHash().get_node('key') is None
+
+    def test_minimal_remapping(self):
+        ring = ConsistentHash(['a', 'b', 'c'])
+        before = dict((key, ring.get_node(key)) for key in self.keys)
+        ring.add_node('d')
+        moved = [key for key in self.keys if ring.get_node(key) != before[key]]
+        assert all(ring.get_node(key) == 'd' for key in moved)
+        assert len(moved) < len(self.keys) / 4 * 1.5
+
+        ring.remove_node('d')
+        assert ring.nodes == ['a', 'b', 'c']
+        assert all(ring.get_node(key) == before[key] for key in self.keys)
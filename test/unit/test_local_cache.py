@@ -0,0 +1,95 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+from nucleus.db.local_cache import LocalCache
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestLocalCache(TestCase):
+
+    def test_get_and_set(self):
+        local_cache = LocalCache(max_entries=10, max_bytes=1024)
+        assert local_cache.set('c_key', 'value', 60)
+        assert local_cache.get('c_key') == 'value'
+        assert local_cache.get('c_missing') is None
+        assert local_cache.stats()['hits'] == 1
+        assert local_cache.stats()['misses'] == 1
+
+    def test_expiry(self):
+        local_cache = LocalCache(max_entries=10, max_bytes=1024)
+        local_cache.set('c_key', 'value', 0.01)
+        time.sleep(0.02)
+        assert local_cache.get('c_key') is None
+        assert local_cache.stats()['entries'] == 0
+
+    def test_lru_eviction_by_entries(self):
+        local_cache = LocalCache(max_entries=2, max_bytes=1024)
+        local_cache.set('c_1', 'a', 60)
+        local_cache.set('c_2', 'b', 60)
+        local_cache.get('c_1')
+        local_cache.set('c_3', 'c', 60)
+        assert local_cache.get('c_2') is None
+        assert local_cache.get('c_1') == 'a'
+        assert local_cache.get('c_3') == 'c'
+        assert local_cache.stats()['evictions'] == 1
+
+    def test_eviction_by_bytes(self):
+        local_cache = LocalCache(max_entries=10, max_bytes=10)
+        local_cache.set('c_1', 'aaaaaa', 60)
+        local_cache.set('c_2', 'bbbbbb', 60)
+        assert local_cache.get('c_1') is None
+        assert local_cache.stats()['bytes'] == 6
+        assert not local_cache.set('c_3', 'c' * 11, 60)
+
+    def test_invalidate_tags(self):
+        local_cache = LocalCache(max_entries=10, max_bytes=1024)
+        local_cache.set('c_1', 'a', 60, tags=['t:orders'])
+        local_cache.set('c_2', 'b', 60, tags=['t:users'])
+        assert local_cache.invalidate_tags(['t:orders']) == 1
+        assert local_cache.get('c_1') is None
+        assert local_cache.get('c_2') == 'b'
+        assert local_cache.stats()['bytes'] == 1
+
+    def test_set_is_refused_after_invalidation(self):
+        # Response computed before a write must not be set to L1 after the write has invalidated its tags.
+        local_cache = LocalCache(max_entries=10, max_bytes=1024)
+        generations = local_cache.generations(['t:orders'])
+        local_cache.invalidate_tags(['t:orders'])
+        assert not local_cache.set('c_1', 'a', 60, tags=['t:orders'], generations=generations)
+        assert local_cache.get('c_1') is None
+        assert local_cache.set('c_1', 'a', 60, tags=['t:orders'], generations=local_cache.generations(['t:orders']))
+
+    def test_writes_invalidate_every_local_cache_in_process(self):
+        # As done by models of the writing worker once a write is committed.
+        local_caches = [LocalCache(max_entries=10, max_bytes=1024) for _ in range(2)]
+        for local_cache in local_caches:
+            local_cache.set('c_1', 'a', 60, tags=['t:orders'])
+        assert LocalCache.invalidate_tags_in_process(['t:orders']) == 2
+        assert all(local_cache.get('c_1') is None for local_cache in local_caches)
@@ -0,0 +1,85 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import tempfile
+from nucleus.db.connection_manager import ConnectionManager
+from sqlalchemy import create_engine
+from sqlalchemy.exc import NoSuchTableError
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestMetadataCache(TestCase):
+
+    def setUp(self):
+        database_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(database_dir.cleanup)
+        self.engine = create_engine('sqlite:///{}'.format(os.path.join(database_dir.name, 'proton.db')))
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(ConnectionManager.invalidate_metadata, self.engine)
+        self.engine.execute('CREATE TABLE employee (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def test_metadata_is_reflected_once(self):
+        metadata = ConnectionManager.reflected_metadata(self.engine)
+        assert 'employee' in metadata.tables
+        assert ConnectionManager.reflected_metadata(self.engine) is metadata
+        assert ConnectionManager.reflected_table(self.engine, 'employee') is metadata.tables['employee']
+
+    def test_table_created_since_reflection_is_reflected_on_its_own(self):
+        metadata = ConnectionManager.reflected_metadata(self.engine)
+        self.engine.execute('CREATE TABLE project (id INTEGER PRIMARY KEY)')
+        assert 'project' not in metadata.tables
+        assert ConnectionManager.reflected_table(self.engine, 'project').name == 'project'
+        assert 'project' in ConnectionManager.reflected_metadata(self.engine).tables
+
+    def test_metadata_is_invalidated_after_ddl(self):
+        metadata = ConnectionManager.reflected_metadata(self.engine)
+        assert [column.name for column in metadata.tables['employee'].columns] == ['id', 'name']
+
+        for sql in ['ALTER TABLE employee ADD COLUMN email TEXT', 'SELECT id FROM employee']:
+            self.engine.execute(sql)
+            if ConnectionManager.is_ddl(sql):
+                ConnectionManager.invalidate_metadata(self.engine)
+
+        employee_table = ConnectionManager.reflected_table(self.engine, 'employee')
+        assert [column.name for column in employee_table.columns] == ['id', 'name', 'email']
+        assert ConnectionManager.reflected_metadata(self.engine) is not metadata
+
+    def test_is_ddl(self):
+        assert ConnectionManager.is_ddl('CREATE TABLE project (id INTEGER)')
+        assert ConnectionManager.is_ddl('  alter table employee add column email text')
+        assert ConnectionManager.is_ddl('DROP TABLE employee')
+        assert not ConnectionManager.is_ddl('SELECT * FROM employee')
+        assert not ConnectionManager.is_ddl('INSERT INTO employee (name) VALUES (\'created\')')
+
+    def test_has_table(self):
+        assert ConnectionManager.has_table(self.engine, 'employee')
+        assert not ConnectionManager.has_table(self.engine, 'missing')
+        with self.assertRaises(NoSuchTableError):
+            ConnectionManager.reflected_table(self.engine, 'missing')
@@ -0,0 +1,74 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from jinja2 import Environment
+from nucleus.db.query_template_cache import QueryTemplateCache
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class RecordingJinjaSql(object):
+    """
+    Stand-in for JinjaSql; records templates it is asked to prepare.
+    """
+
+    def __init__(self):
+        self.param_style = 'named'
+        self.env = Environment()
+        self.prepared = []
+
+    def prepare_query(self, template, data):
+        self.prepared.append(template)
+        return template.render(**data), {}
+
+
+class TestQueryTemplateCache(TestCase):
+
+    def setUp(self):
+        self.j_sql = RecordingJinjaSql()
+        self.query_templates = QueryTemplateCache(self.j_sql, max_entries=2)
+
+    def test_fast_path(self):
+        sql = 'SELECT name FROM employee WHERE id = {{ employeeId }} AND project = {{project}}'
+        expected = ('SELECT name FROM employee WHERE id = :employeeId AND project = :project',
+                    {'employeeId': 1, 'project': 'proton'})
+        assert self.query_templates.prepare(sql, {'employeeId': 1, 'project': 'proton', 'unused': 0}) == expected
+        assert self.query_templates.prepare(sql, {'employeeId': 1, 'project': 'proton'}) == expected
+        assert self.j_sql.prepared == []
+
+    def test_jinja_path_and_eviction(self):
+        sql = 'SELECT name FROM employee {% if employeeId %}WHERE id = {{ employeeId }}{% endif %}'
+        assert self.query_templates.prepare(sql, {'employeeId': 7})[0] == 'SELECT name FROM employee WHERE id = 7'
+        assert self.query_templates.prepare(sql, {})[0] == 'SELECT name FROM employee '
+        # Compiled once; rendered twice.
+        assert len(self.j_sql.prepared) == 2 and self.j_sql.prepared[0] is self.j_sql.prepared[1]
+
+        self.query_templates.prepare('SELECT 1', {})
+        self.query_templates.prepare('SELECT 2', {})
+        assert len(self.query_templates) == 2
+        self.query_templates.prepare(sql, {})
+        assert self.j_sql.prepared[-1] is not self.j_sql.prepared[0]
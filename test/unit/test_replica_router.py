@@ -0,0 +1,81 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+from nucleus.db.replica_router import ReplicaRouter
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestReplicaRouter(TestCase):
+
+    replicas = [{'name': 'a', 'pool': None, 'weight': 2}, {'name': 'b', 'pool': None}]
+
+    def test_round_robin_is_weighted(self):
+        router = ReplicaRouter(self.replicas, strategy='round_robin')
+        picks = []
+        for _ in range(6):
+            replica = router.acquire()
+            picks.append(replica['name'])
+            router.release(replica)
+        assert picks == ['a', 'b', 'a', 'a', 'b', 'a']
+
+    def test_least_connections(self):
+        router = ReplicaRouter(self.replicas, strategy='least_connections')
+        first, second, third = router.acquire(), router.acquire(), router.acquire()
+        assert [first['name'], second['name'], third['name']] == ['a', 'b', 'a']
+        router.release(second)
+        assert router.acquire()['name'] == 'b'
+        assert [replica['in_flight'] for replica in router.stats()] == [2, 1]
+
+    def test_failed_replica_is_out_of_rotation(self):
+        router = ReplicaRouter(self.replicas, retry_interval=0.05)
+        router.release(router.acquire(), failed=True)
+        assert router.stats()[0]['healthy'] is False
+        assert {router.acquire()['name'] for _ in range(3)} == {'b'}
+        router.mark_down(router.replica('b'))
+        assert router.acquire() is None
+        time.sleep(0.06)
+        assert router.acquire() is not None
+
+    def test_read_after_write_stays_on_primary(self):
+        router = ReplicaRouter(self.replicas, read_after_write_window=0.05)
+        router.record_write(['t:employee'])
+        assert router.acquire(['t:employee']) is None
+        assert router.acquire(['t:project']) is not None
+        # Tables of a read are not known; any recent write keeps it on primary.
+        assert router.acquire() is None
+        time.sleep(0.06)
+        assert router.acquire(['t:employee']) is not None
+
+        # Tables of a write are not known; every read stays on primary.
+        router.record_write()
+        assert router.acquire(['t:project']) is None
+
+    def test_invalid_strategy(self):
+        self.assertRaises(ValueError, ReplicaRouter, self.replicas, strategy='random')
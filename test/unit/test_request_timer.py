@@ -0,0 +1,71 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+import time
+from nucleus.generics.request_timer import RequestTimer
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestRequestTimer(TestCase):
+
+    def test_nested_phases(self):
+        timer = RequestTimer()
+        with timer.phase('controller'):
+            time.sleep(0.02)
+            with timer.phase('db'):
+                time.sleep(0.03)
+        with timer.phase('db'):
+            time.sleep(0.01)
+        assert list(timer.phases) == ['db', 'controller']
+        assert 0.02 <= timer.phases['controller'] < 0.03
+        assert 0.04 <= timer.phases['db'] < 0.05
+        assert sum(timer.phases.values()) <= timer.elapsed()
+
+        server_timing = timer.server_timing().split(', ')
+        assert [metric.split(';')[0] for metric in server_timing] == ['db', 'controller', 'total']
+        assert all(metric.split(';dur=')[1].replace('.', '').isdigit() for metric in server_timing)
+
+    def test_measure_current(self):
+        with RequestTimer.measure('db'):
+            # No request is being serviced; nothing to record.
+            pass
+
+        timer = RequestTimer()
+        timer.activate()
+        try:
+            with RequestTimer.measure('db'):
+                timers_of_other_thread = []
+                other = threading.Thread(target=lambda: timers_of_other_thread.append(RequestTimer.current()))
+                other.start()
+                other.join()
+            assert timers_of_other_thread == [None]
+            assert RequestTimer.current() is timer and 'db' in timer.phases
+        finally:
+            timer.deactivate()
+        assert RequestTimer.current() is None
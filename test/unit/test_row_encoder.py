@@ -0,0 +1,62 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import datetime
+import decimal
+import json
+import uuid
+from nucleus.db.row_encoder import RowEncoder
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestRowEncoder(TestCase):
+
+    def test_encode(self):
+        encoder = RowEncoder(['id', 'joined', 'salary', 'token', 'name', 'manager'])
+        rows = [(1, datetime.datetime(2018, 7, 1, 9, 30, 15, 250), decimal.Decimal('1050.25'), uuid.UUID(int=7),
+                 'Pooja', None),
+                (2, datetime.date(2018, 7, 2), decimal.Decimal('10'), uuid.UUID(int=8), 'Pruthvi', 1)]
+        assert json.loads(encoder.encode(rows)) == [
+            {'id': 1, 'joined': '2018-07-01T09:30:15.000250', 'salary': '1050.25',
+             'token': '00000000-0000-0000-0000-000000000007', 'name': 'Pooja', 'manager': None},
+            {'id': 2, 'joined': '2018-07-02', 'salary': '10', 'token': '00000000-0000-0000-0000-000000000008',
+             'name': 'Pruthvi', 'manager': 1}]
+        assert encoder.encode([]) == '[]'
+        assert json.loads(b'[' + encoder.encode_rows(rows) + b']') == json.loads(encoder.encode(rows))
+
+    def test_decimal_keeps_precision(self):
+        encoder = RowEncoder(['balance'])
+        rows = [(decimal.Decimal('12345678901234567.89'),), (decimal.Decimal('-0.000000000000000000000001'),)]
+        records = json.loads(encoder.encode(rows))
+        assert [decimal.Decimal(record['balance']) for record in records] == [row[0] for row in rows]
+
+    def test_from_cursor(self):
+        class Cursor(object):
+            description = [('id', None), ('name', None)]
+
+        assert RowEncoder.from_cursor(Cursor()).records([(1, 'proton')]) == [{'id': 1, 'name': 'proton'}]
@@ -0,0 +1,64 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import json
+import sqlite3
+from nucleus.db.row_stream import RowStream
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestRowStream(TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE employee (id INTEGER, name TEXT)')
+        self.connection.executemany('INSERT INTO employee VALUES (?, ?)', [(i, 'e{}'.format(i)) for i in range(5)])
+        self.closed = []
+
+    def tearDown(self):
+        self.connection.close()
+
+    def stream(self, sql):
+        cursor = self.connection.cursor()
+        cursor.execute(sql)
+        return RowStream(cursor, chunk_size=2, on_close=lambda: self.closed.append(True))
+
+    def test_chunks(self):
+        chunks = list(self.stream('SELECT id, name FROM employee ORDER BY id'))
+        assert len(chunks) == 4
+        assert json.loads(b''.join(chunks)) == [{'id': i, 'name': 'e{}'.format(i)} for i in range(5)]
+        assert self.closed == [True]
+
+        assert list(self.stream('SELECT id FROM employee WHERE id < 0')) == [b'[]']
+
+    def test_close_midway(self):
+        stream = self.stream('SELECT id FROM employee')
+        next(iter(stream))
+        stream.close()
+        stream.close()
+        assert self.closed == [True]
@@ -0,0 +1,87 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Pruthvi Kumar All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+# disclaimer.
+#
+# Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+# disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import sqlite3
+import tempfile
+import threading
+from nucleus.db.sqlite_connections import SQLiteConnections
+from unittest import TestCase
+
+__author__ = "Pooja Pruthvi, pooja.pruthvikumar@gmail.com"
+__copyright__ = "Copyright (C) 2018 Pooja Pruthvi"
+__license__ = "BSD 3-Clause License"
+__version__ = "1.0"
+
+
+class TestSQLiteConnections(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'proton-test.db')
+        self.writer = SQLiteConnections(self.database, synchronous='NORMAL', cache_size=-1024, busy_timeout=1000)
+        self.reader = SQLiteConnections(self.database, read_only=True, busy_timeout=1000)
+
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+        self.directory.cleanup()
+
+    def test_per_thread_connections(self):
+        connection = self.writer.connection()
+        assert connection is self.writer.connection()
+        assert connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert connection.execute('PRAGMA busy_timeout').fetchone()[0] == 1000
+
+        connections_of_other_thread = []
+        other = threading.Thread(target=lambda: connections_of_other_thread.append(self.writer.connection()))
+        other.start()
+        other.join()
+        assert connections_of_other_thread[0] is not connection
+
+    def test_read_only(self):
+        connection = self.writer.connection()
+        connection.execute('CREATE TABLE employee (name TEXT)')
+        connection.execute("INSERT INTO employee VALUES ('proton')")
+        connection.commit()
+
+        reader = self.reader.connection()
+        assert reader.execute('SELECT name FROM employee').fetchall() == [('proton',)]
+        self.assertRaises(sqlite3.OperationalError, reader.execute, "INSERT INTO employee VALUES ('x')")
+
+    def test_read_only_path_with_uri_characters(self):
+        database = os.path.join(self.directory.name, 'proton?#%20.db')
+        writer = SQLiteConnections(database)
+        writer.connection().execute('CREATE TABLE employee (name TEXT)')
+        writer.connection().commit()
+        reader = SQLiteConnections(database, read_only=True)
+        try:
+            assert reader.connection().execute('SELECT count(*) FROM employee').fetchone() == (0,)
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_read_only_before_database_exists(self):
+        reader = self.reader.connection()
+        assert reader.execute('PRAGMA query_only').fetchone()[0] == 1
+        self.assertRaises(sqlite3.OperationalError, reader.execute, 'CREATE TABLE employee (name TEXT)')